@@ -1,14 +1,109 @@
 """Configuration management for the Telegram bot."""
 
+import copy
+import glob
+import hashlib
+import json
 import os
+import re
+import tempfile
 import yaml
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 from pathlib import Path
 from dotenv import load_dotenv
 import structlog
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 logger = structlog.get_logger(__name__)
 
+# Parsed YAML keyed by (resolved path, mtime in ns); editing the file changes the key
+_PARSED_CACHE: Dict[Tuple[str, int], Dict[str, Any]] = {}
+
+# JSON copies of parsed YAML files, named by hashes of the YAML path and source
+_JSON_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "telegram-bot"
+
+
+def _remove_stale_sidecars(path: Path, path_digest: str, keep: Path):
+    """Delete JSON copies of earlier versions of a YAML file.
+    
+    Other files with the same name but a different location are left alone.
+    
+    Args:
+        path: Path to the YAML file
+        path_digest: Hash of the resolved YAML path used in sidecar names
+        keep: Sidecar for the current version
+    """
+    pattern = re.compile(re.escape(f"{path.name}.{path_digest}.") + r"[0-9a-f]{16}\.json")
+    for candidate in _JSON_CACHE_DIR.glob(f"{glob.escape(path.name)}.{path_digest}.*.json"):
+        if candidate != keep and pattern.fullmatch(candidate.name):
+            candidate.unlink(missing_ok=True)
+
+
+def _load_with_json_cache(path: Path) -> Dict[str, Any]:
+    """Parse a YAML file, loading a JSON copy of an earlier parse when one exists.
+    
+    Args:
+        path: Path to the YAML file
+        
+    Returns:
+        Parsed mapping
+    """
+    source = path.read_bytes()
+    path_digest = hashlib.blake2b(str(path.resolve()).encode('utf-8'), digest_size=8).hexdigest()
+    digest = hashlib.blake2b(source, digest_size=8).hexdigest()
+    sidecar = _JSON_CACHE_DIR / f"{path.name}.{path_digest}.{digest}.json"
+    
+    try:
+        cached = json.loads(sidecar.read_bytes())
+        if isinstance(cached, dict):
+            return cached
+    except (OSError, ValueError):
+        pass
+    
+    parsed = yaml.load(source.decode('utf-8'), Loader=_YamlLoader) or {}
+    
+    # Only cache mappings that survive the JSON round trip unchanged
+    try:
+        encoded = json.dumps(parsed)
+        if json.loads(encoded) == parsed:
+            # The parsed config can hold tokens, so keep the cache private to the user
+            sidecar.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            os.chmod(sidecar.parent, 0o700)
+            fd, partial = tempfile.mkstemp(dir=sidecar.parent, prefix=f"{sidecar.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as handle:
+                    handle.write(encoded)
+                os.replace(partial, sidecar)
+            except BaseException:
+                Path(partial).unlink(missing_ok=True)
+                raise
+            _remove_stale_sidecars(path, path_digest, keep=sidecar)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("Skipped JSON config cache", path=str(path), error=str(e))
+    
+    return parsed
+
+
+def _load_yaml(path: Path) -> Dict[str, Any]:
+    """Parse a YAML file, reusing the previous result while the file is unchanged.
+    
+    Args:
+        path: Path to the YAML file
+        
+    Returns:
+        Deep copy of the parsed mapping, so callers never share nested values
+    """
+    key = (str(path.resolve()), path.stat().st_mtime_ns)
+    parsed = _PARSED_CACHE.get(key)
+    if parsed is None:
+        parsed = _load_with_json_cache(path)
+        _PARSED_CACHE[key] = parsed
+    return copy.deepcopy(parsed)
+
 
 class Config:
     """Configuration class that loads settings from .env and config.yaml files."""
@@ -35,8 +130,7 @@ class Config:
         self.yaml_config: Dict[str, Any] = {}
         if self.config_path.exists():
             try:
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    self.yaml_config = yaml.safe_load(f) or {}
+                self.yaml_config = _load_yaml(self.config_path)
                 logger.info("Loaded YAML configuration", path=str(self.config_path))
             except yaml.YAMLError as e:
                 logger.error("Invalid YAML configuration", path=str(self.config_path), error=str(e))
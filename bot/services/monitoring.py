@@ -1,6 +1,7 @@
 """System monitoring service for sending alerts."""
 
 import asyncio
+import time
 import psutil
 from typing import Dict, List, Optional
 from ..config import config
@@ -104,7 +105,7 @@ class MonitoringService:
         """
         # Check cooldown to avoid spam
         alert_key = f"{metric}_{threshold}"
-        current_time = asyncio.get_event_loop().time()
+        current_time = time.monotonic()
         
         if (alert_key in self._last_alerts and 
             current_time - self._last_alerts[alert_key] < self.alert_cooldown):
@@ -1,8 +1,11 @@
 """Scheduling service for automated notifications."""
 
 import asyncio
+import inspect
 from datetime import datetime, timedelta
 from typing import Dict, List, Callable, Optional, Any
+from apscheduler.executors.asyncio import AsyncIOExecutor
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
@@ -22,7 +25,13 @@ class SchedulerService:
     def __init__(self):
         self.scheduler = AsyncIOScheduler(
             timezone=config.scheduler_timezone,
-            max_workers=config.scheduler_max_workers
+            executors={
+                # Coroutine jobs (notifications, reports) run on the event loop
+                'default': AsyncIOExecutor(),
+                # Sync custom jobs get a dedicated pool sized by scheduler_max_workers;
+                # AsyncIOExecutor would otherwise hand them to the loop's shared default executor
+                'threadpool': ThreadPoolExecutor(max_workers=config.scheduler_max_workers)
+            }
         )
         self._scheduled_jobs: Dict[str, Any] = {}
     
@@ -108,7 +117,7 @@ class SchedulerService:
             logger.info("Notification scheduled",
                        job_id=job_id,
                        trigger_type=trigger_type,
-                       next_run=job.next_run_time)
+                       next_run=getattr(job, 'next_run_time', None))
             
             return True
             
@@ -145,7 +154,7 @@ class SchedulerService:
             logger.info("Daily system report scheduled",
                        job_id=job_id,
                        time=f"{hour:02d}:{minute:02d}",
-                       next_run=job.next_run_time)
+                       next_run=getattr(job, 'next_run_time', None))
             
             return True
             
@@ -183,7 +192,7 @@ class SchedulerService:
                        job_id=job_id,
                        day_of_week=day_of_week,
                        time=f"{hour:02d}:{minute:02d}",
-                       next_run=job.next_run_time)
+                       next_run=getattr(job, 'next_run_time', None))
             
             return True
             
@@ -221,18 +230,19 @@ class SchedulerService:
                 logger.error("Invalid trigger type", trigger_type=trigger_type)
                 return False
             
-            # Schedule the job
+            # Schedule the job; sync callables run on the dedicated threadpool executor
             job = self.scheduler.add_job(
                 func=func,
                 trigger=trigger,
                 id=job_id,
+                executor='default' if inspect.iscoroutinefunction(func) else 'threadpool',
                 replace_existing=True
             )
             
             logger.info("Custom job scheduled",
                        job_id=job_id,
                        trigger_type=trigger_type,
-                       next_run=job.next_run_time)
+                       next_run=getattr(job, 'next_run_time', None))
             
             return True
             
@@ -1,6 +1,7 @@
 """Subscription management service."""
 
-from typing import List, Dict, Set, Optional
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Set, Optional, Tuple
 import json
 from pathlib import Path
 from ..constants import SUBSCRIPTION_TYPES
@@ -20,19 +21,27 @@ class SubscriptionService:
         """
         self.storage_file = storage_file or Path("subscriptions.json")
         self._subscriptions: Dict[int, Set[str]] = {}
+        self._subscribers_cache: Dict[str, List[int]] = {}
+        self._subscribers_cache_source: Optional[Dict[int, Set[str]]] = None
+        self._bulk_depth = 0
+        self._bulk_dirty = False
         self._load_subscriptions()
     
+    def _invalidate_subscribers_cache(self):
+        """Drop memoized subscriber lookups after subscriptions change."""
+        self._subscribers_cache = {}
+        self._subscribers_cache_source = self._subscriptions
+    
     def _load_subscriptions(self):
         """Load subscriptions from storage file."""
         try:
             if self.storage_file.exists():
-                with open(self.storage_file, 'r') as f:
-                    data = json.load(f)
-                    # Convert string keys back to int and lists to sets
-                    self._subscriptions = {
-                        int(user_id): set(subs) 
-                        for user_id, subs in data.items()
-                    }
+                data = json.loads(self.storage_file.read_text())
+                # Convert string keys back to int and lists to sets
+                self._subscriptions = {
+                    int(user_id): set(subs) 
+                    for user_id, subs in data.items()
+                }
                 logger.info("Subscriptions loaded", 
                            file=str(self.storage_file),
                            users=len(self._subscriptions))
@@ -41,9 +50,32 @@ class SubscriptionService:
         except Exception as e:
             logger.error("Error loading subscriptions", error=str(e))
             self._subscriptions = {}
+        finally:
+            self._invalidate_subscribers_cache()
+    
+    @contextmanager
+    def bulk_mode(self) -> Iterator["SubscriptionService"]:
+        """Defer saving until the outermost bulk block exits, then save once.
+        
+        Yields:
+            This service instance
+        """
+        self._bulk_depth += 1
+        try:
+            yield self
+        finally:
+            self._bulk_depth -= 1
+            if self._bulk_depth == 0 and self._bulk_dirty:
+                self._bulk_dirty = False
+                self._save_subscriptions()
     
     def _save_subscriptions(self):
         """Save subscriptions to storage file."""
+        self._invalidate_subscribers_cache()
+        if self._bulk_depth:
+            self._bulk_dirty = True
+            return
+        
         try:
             # Convert sets to lists for JSON serialization
             data = {
@@ -54,8 +86,7 @@ class SubscriptionService:
             # Ensure directory exists
             self.storage_file.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(self.storage_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            self.storage_file.write_text(json.dumps(data, indent=2))
                 
             logger.debug("Subscriptions saved", file=str(self.storage_file))
         except Exception as e:
@@ -84,12 +115,11 @@ class SubscriptionService:
                           subscription_type=subscription_type)
             return False
         
-        # Add subscription
-        if user_id not in self._subscriptions:
-            self._subscriptions[user_id] = set()
-        
-        self._subscriptions[user_id].add(subscription_type)
-        self._save_subscriptions()
+        # Add subscription; a repeat subscribe leaves the store untouched
+        subscriptions = self._subscriptions.setdefault(user_id, set())
+        if subscription_type not in subscriptions:
+            subscriptions.add(subscription_type)
+            self._save_subscriptions()
         
         logger.info("User subscribed",
                    user_id=user_id,
@@ -98,6 +128,46 @@ class SubscriptionService:
         
         return True
     
+    async def subscribe_many(
+        self, 
+        subscriptions: List[Tuple[int, int, str]]
+    ) -> List[bool]:
+        """Subscribe several users at once, saving the store a single time.
+        
+        Args:
+            subscriptions: (user_id, chat_id, subscription_type) tuples
+            
+        Returns:
+            One result per tuple, True if successful, False if invalid type
+        """
+        valid_types = set(SUBSCRIPTION_TYPES.values())
+        results = []
+        changed = False
+        
+        with self.bulk_mode():
+            for user_id, chat_id, subscription_type in subscriptions:
+                if subscription_type not in valid_types:
+                    logger.warning("Invalid subscription type", 
+                                  user_id=user_id,
+                                  subscription_type=subscription_type)
+                    results.append(False)
+                    continue
+                
+                # A repeat subscription leaves the store untouched
+                user_subscriptions = self._subscriptions.setdefault(user_id, set())
+                if subscription_type not in user_subscriptions:
+                    user_subscriptions.add(subscription_type)
+                    changed = True
+                results.append(True)
+            
+            if changed:
+                self._save_subscriptions()
+        
+        logger.info("Users subscribed",
+                   count=results.count(True))
+        
+        return results
+    
     async def unsubscribe(
         self, 
         user_id: int, 
@@ -165,10 +235,18 @@ class SubscriptionService:
         Returns:
             List of user IDs
         """
-        subscribers = [
-            user_id for user_id, subs in self._subscriptions.items()
-            if subscription_type in subs
-        ]
+        # The cache is cleared on every save/load; also discard it if the
+        # subscriptions mapping itself has been replaced
+        if self._subscribers_cache_source is not self._subscriptions:
+            self._invalidate_subscribers_cache()
+        
+        # Index every type in one pass so lookups for other types are free
+        if not self._subscribers_cache:
+            for user_id, subs in self._subscriptions.items():
+                for subs_type in subs:
+                    self._subscribers_cache.setdefault(subs_type, []).append(user_id)
+        
+        subscribers = list(self._subscribers_cache.get(subscription_type, ()))
         
         logger.debug("Retrieved subscribers",
                     subscription_type=subscription_type,
@@ -1,11 +1,13 @@
 """Utility functions for the Telegram bot."""
 
 from .retry import RetryHandler
+from .ratelimit import RateLimiter
 from .formatters import format_message, format_system_info, format_error
 from .validators import validate_chat_id, validate_message
 
 __all__ = [
     'RetryHandler',
+    'RateLimiter',
     'format_message',
     'format_system_info', 
     'format_error',
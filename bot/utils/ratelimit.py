@@ -0,0 +1,52 @@
+"""Sliding-window rate limiting utility."""
+
+import time
+from collections import defaultdict, deque
+from typing import Deque, DefaultDict, Hashable
+
+from ..constants import RATE_LIMITS
+
+
+class RateLimiter:
+    """Limits each key to a number of requests within a sliding time window."""
+    
+    def __init__(self, rate_limit: int = RATE_LIMITS['COMMANDS_PER_MINUTE'], window: float = 60.0):
+        """Initialize rate limiter.
+        
+        Args:
+            rate_limit: Maximum requests allowed per key within the window
+            window: Window length in seconds
+        """
+        self.rate_limit = rate_limit
+        self.window = window
+        self._requests: DefaultDict[Hashable, Deque[float]] = defaultdict(deque)
+    
+    def is_rate_limited(self, key: Hashable) -> bool:
+        """Check a request for a key and record it if allowed.
+        
+        Args:
+            key: Identifier to limit, e.g. a user ID
+        
+        Returns:
+            True if the request exceeds the limit, False if it was recorded
+        """
+        now = time.monotonic()
+        requests = self._requests[key]
+        
+        # Timestamps are appended in order, so expired ones are at the left
+        while requests and now - requests[0] >= self.window:
+            requests.popleft()
+        
+        if len(requests) >= self.rate_limit:
+            return True
+        
+        requests.append(now)
+        return False
+    
+    def reset(self, key: Hashable) -> None:
+        """Forget all recorded requests for a key.
+        
+        Args:
+            key: Identifier to reset
+        """
+        self._requests.pop(key, None)
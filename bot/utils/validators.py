@@ -1,8 +1,25 @@
 """Validation utilities for the Telegram bot."""
 
+import hashlib
+import hmac
+import os
 import re
+from functools import lru_cache
 from typing import Union, Optional, Tuple
 
+_SYSTEM_PATH_PREFIXES = ('/etc/', '/root/', '/sys/', '/proc/', '/dev/', '/var/log/')
+
+# Compiled once at import; the validators below run on every request
+_CHANNEL_USERNAME_RE = re.compile(r'^@[a-zA-Z0-9_]{5,}$')
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+_URL_RE = re.compile(
+    r'https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)', re.IGNORECASE)
+
 
 def validate_chat_id(chat_id: Union[str, int]) -> bool:
     """Validate Telegram chat ID.
@@ -23,7 +40,7 @@ def validate_chat_id(chat_id: Union[str, int]) -> bool:
         
         # Check if it's a channel/group username
         if chat_id.startswith('@') and len(chat_id) > 1:
-            return bool(re.match(r'^@[a-zA-Z0-9_]{5,}$', chat_id))
+            return bool(_CHANNEL_USERNAME_RE.match(chat_id))
     
     return False
 
@@ -65,20 +82,16 @@ def validate_file_path(file_path: str) -> Tuple[bool, Optional[str]]:
     if not file_path.strip():
         return False, "File path cannot be empty"
     
-    # Resolve path to check for traversal attempts
-    import os
+    # Check for common traversal patterns before doing any path work
+    if '..' in file_path or '~' in file_path:
+        return False, "Path traversal patterns not allowed"
+    
     try:
         resolved_path = os.path.abspath(file_path)
         
         # Check for potentially dangerous paths
-        dangerous_paths = ['/etc/', '/root/', '/sys/', '/proc/', '/dev/', '/var/log/']
-        for dangerous_path in dangerous_paths:
-            if resolved_path.startswith(dangerous_path):
-                return False, f"Access to system path not allowed: {resolved_path}"
-        
-        # Check for common traversal patterns
-        if '..' in file_path or '~' in file_path:
-            return False, "Path traversal patterns not allowed"
+        if resolved_path.startswith(_SYSTEM_PATH_PREFIXES):
+            return False, f"Access to system path not allowed: {resolved_path}"
         
         # Additional check: ensure path doesn't escape intended directory
         # This should be customized based on your application's allowed directories
@@ -89,6 +102,32 @@ def validate_file_path(file_path: str) -> Tuple[bool, Optional[str]]:
         return False, f"Invalid file path: {str(e)}"
 
 
+def validate_url(url: str) -> bool:
+    """Validate an http(s) URL, e.g. a webhook URL.
+    
+    Args:
+        url: URL to validate
+        
+    Returns:
+        True if valid, False otherwise
+    """
+    if not isinstance(url, str):
+        return False
+    
+    return bool(_URL_RE.fullmatch(url))
+
+
+@lru_cache(maxsize=4)
+def _hmac_template(secret: bytes) -> "hmac.HMAC":
+    """Build a keyed HMAC-SHA256 once per secret for callers to copy().
+    
+    Copying skips re-deriving the inner and outer key pads on every call.
+    The cache is small because only a handful of secrets are live at once,
+    e.g. the old and new secret while rotating.
+    """
+    return hmac.new(secret, digestmod=hashlib.sha256)
+
+
 def validate_webhook_signature(payload: bytes, signature: str, secret: str) -> bool:
     """Validate webhook signature using HMAC.
     
@@ -100,9 +139,6 @@ def validate_webhook_signature(payload: bytes, signature: str, secret: str) -> b
     Returns:
         True if signature is valid, False otherwise
     """
-    import hmac
-    import hashlib
-    
     if not secret or not signature:
         return False
     
@@ -110,14 +146,17 @@ def validate_webhook_signature(payload: bytes, signature: str, secret: str) -> b
     if not signature.startswith('sha256='):
         return False
     
-    expected_signature = 'sha256=' + hmac.new(
-        secret.encode('utf-8'),
-        payload,
-        hashlib.sha256
-    ).hexdigest()
+    mac = _hmac_template(secret.encode('utf-8')).copy()
+    mac.update(payload)
+    expected_digest = mac.hexdigest()
     
-    # Use constant time comparison
-    return hmac.compare_digest(signature, expected_signature)
+    # Use constant time comparison; comparing bytes means a non-ASCII
+    # header is simply a mismatch instead of a TypeError
+    provided_digest = signature[len('sha256='):]
+    return hmac.compare_digest(
+        provided_digest.encode('utf-8'),
+        expected_digest.encode('ascii')
+    )
 
 
 def validate_webhook_token(token: str, expected_token: str) -> bool:
@@ -130,16 +169,15 @@ def validate_webhook_token(token: str, expected_token: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    import hmac
-    
     if not isinstance(token, str) or not isinstance(expected_token, str):
         return False
     
     if not token or not expected_token:
         return False
     
-    # Use hmac.compare_digest for constant time comparison to prevent timing attacks
-    return hmac.compare_digest(token, expected_token)
+    # Use hmac.compare_digest for constant time comparison to prevent timing attacks;
+    # it only accepts ASCII str, so compare the UTF-8 bytes instead
+    return hmac.compare_digest(token.encode('utf-8'), expected_token.encode('utf-8'))
 
 
 def validate_parse_mode(parse_mode: str) -> bool:
@@ -165,7 +203,7 @@ def sanitize_filename(filename: str) -> str:
         Sanitized filename
     """
     # Remove or replace dangerous characters
-    sanitized = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    sanitized = _UNSAFE_FILENAME_CHARS_RE.sub('_', filename)
     
     # Remove leading/trailing dots and spaces
     sanitized = sanitized.strip('. ')
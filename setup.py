@@ -40,7 +40,9 @@ setup(
     extras_require={
         "dev": [
             "pytest>=6.0",
-            "pytest-asyncio>=0.21.0",
+            "pytest-asyncio>=0.26.0",
+            "pytest-xdist>=3.0.0",
+            "uvloop>=0.19.0; sys_platform != 'win32'",
             "black>=22.0",
             "isort>=5.0",
         ],
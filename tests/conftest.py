@@ -0,0 +1,170 @@
+"""Shared pytest fixtures for the test suite."""
+
+import importlib
+import json
+import os
+import shutil
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:  # optional; the stock asyncio loop is used without it
+    uvloop = None
+
+_CACHE_HOME_KEY = pytest.StashKey[tuple]()
+
+_CANONICAL_SUBSCRIPTIONS = json.dumps({"123456789": ["system", "errors"]}).encode()
+
+
+async def _send_message_ok(*args, **kwargs):
+    """Stand-in for Bot.send_message that always succeeds without recording calls."""
+    return True
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-perf", action="store_true", default=False,
+        help="run tests marked perf (skipped by default)",
+    )
+
+
+def pytest_configure(config):
+    """Keep temporary test files on tmpfs and the config cache out of the home directory.
+
+    ``bot.config`` builds its global Config at import, which happens during
+    collection, before any fixture could redirect the cache; pointing
+    XDG_CACHE_HOME at a per-run directory here catches that load too.
+    """
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        tempfile.tempdir = "/dev/shm"
+    cache_home = tempfile.mkdtemp(prefix="telegram-bot-cache-")
+    config.stash[_CACHE_HOME_KEY] = (os.environ.get("XDG_CACHE_HOME"), cache_home)
+    os.environ["XDG_CACHE_HOME"] = cache_home
+
+
+def pytest_unconfigure(config):
+    """Remove the per-run config cache and restore XDG_CACHE_HOME."""
+    previous, cache_home = config.stash.get(_CACHE_HOME_KEY, (None, None))
+    if cache_home is None:
+        return
+    shutil.rmtree(cache_home, ignore_errors=True)
+    if previous is None:
+        os.environ.pop("XDG_CACHE_HOME", None)
+    else:
+        os.environ["XDG_CACHE_HOME"] = previous
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked perf unless --run-perf was given."""
+    if config.getoption("--run-perf"):
+        return
+    skip_perf = pytest.mark.skip(reason="perf; pass --run-perf to run")
+    for item in items:
+        if "perf" in item.keywords:
+            item.add_marker(skip_perf)
+
+
+if uvloop is not None:
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop's event loop when it is installed."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+@pytest.fixture(scope="session")
+def bot_services():
+    """Import the bot service graph once per session, on first use.
+
+    Keeping these imports out of module scope means collecting tests that
+    never touch the services does not pay for building them. A missing
+    runtime dependency still fails the dependent tests loudly.
+    """
+    return SimpleNamespace(
+        config=importlib.import_module("bot.config").config,
+        notification=importlib.import_module("bot.services.notification").notification_service,
+        subscription=importlib.import_module("bot.services.subscription").subscription_service,
+        monitoring=importlib.import_module("bot.services.monitoring").monitoring_service,
+        scheduler=importlib.import_module("bot.services.scheduler").scheduler_service,
+        commands=importlib.import_module("bot.handlers.commands").command_handlers,
+        TelegramBot=importlib.import_module("bot.main").TelegramBot,
+    )
+
+
+@pytest.fixture(scope="session")
+def _canonical_sub_file(tmp_path_factory):
+    """Write the canonical subscription store once per session."""
+    path = tmp_path_factory.mktemp("subscriptions") / "subs.json"
+    path.write_bytes(_CANONICAL_SUBSCRIPTIONS)
+    return path
+
+
+@pytest.fixture
+def subscription_file(tmp_path, monkeypatch, bot_services, _canonical_sub_file):
+    """Point the global subscription service at a private copy of the canonical store.
+
+    The storage path and in-memory subscriptions are restored after the test.
+    """
+    subscription_service = bot_services.subscription
+
+    path = tmp_path / "subs.json"
+    shutil.copy(_canonical_sub_file, path)
+
+    monkeypatch.setattr(subscription_service, "storage_file", path)
+    monkeypatch.setattr(subscription_service, "_subscriptions", {})
+    subscription_service._load_subscriptions()
+
+    return path
+
+
+@pytest.fixture(scope="session")
+def notification_service():
+    """Build one standalone NotificationService for the session.
+
+    Its bot is an AsyncMock, so no test can reach Telegram through it.
+    send_message is a plain coroutine function so the bulk and concurrent
+    send tests do not pay for AsyncMock call bookkeeping on every message.
+    """
+    from bot.services.notification import NotificationService
+
+    service = NotificationService()
+    service.bot = AsyncMock()
+    service.bot.send_message = _send_message_ok
+    return service
+
+
+@pytest.fixture(scope="session")
+def subscription_service(tmp_path_factory):
+    """Build one standalone SubscriptionService backed by a session temp file."""
+    from bot.services.subscription import SubscriptionService
+
+    return SubscriptionService(
+        storage_file=tmp_path_factory.mktemp("subscription_service") / "subscriptions.json"
+    )
+
+
+@pytest.fixture(scope="session")
+def monitoring_service():
+    """Build one standalone MonitoringService for the session."""
+    from bot.services.monitoring import MonitoringService
+
+    return MonitoringService()
+
+
+@pytest.fixture(autouse=True)
+def reset_subscription_state(request):
+    """Run every test that uses the shared subscription_service on an empty store.
+
+    The store is emptied again on teardown so data a test seeds is not kept
+    alive, or seen, by whichever test the worker runs next.
+    """
+    if "subscription_service" not in request.fixturenames:
+        yield
+        return
+    service = request.getfixturevalue("subscription_service")
+    service._subscriptions = {}
+    yield
+    service._subscriptions = {}
@@ -1,15 +1,12 @@
 """Tests for bot API endpoints."""
 
 import pytest
-import sys
 import os
 import asyncio
 
+from fastapi import HTTPException
 from unittest.mock import AsyncMock, MagicMock, patch
 
-# Add the parent directory to the path to handle relative imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 
 class TestAPIStructure:
     """Test cases for API structure and validation."""
@@ -90,7 +87,6 @@ class TestAPIFunctionality:
             if credentials.credentials == expected_key:
                 return True
             else:
-                from fastapi import HTTPException
                 raise HTTPException(status_code=401, detail="Invalid API key")
         
         # Mock credentials
@@ -114,7 +110,6 @@ class TestAPIFunctionality:
             if token == expected_token:
                 return True
             else:
-                from fastapi import HTTPException
                 raise HTTPException(status_code=401, detail="Invalid webhook token")
         
         # Mock request
@@ -1,9 +1,10 @@
 """Basic tests for the Telegram bot."""
 
 import pytest
-import sys
 import os
+import sys
 import asyncio
+import yaml
 
 from unittest.mock import Mock, patch, AsyncMock
 
@@ -13,13 +14,17 @@ from bot.services.subscription import SubscriptionService
 from bot.utils.validators import validate_chat_id, validate_message
 from bot.utils.formatters import format_message
 
-# Add the parent directory to the path to handle relative imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 
 class TestConfig:
     """Test configuration management."""
     
+    @pytest.fixture
+    def config_module(self, tmp_path, monkeypatch):
+        """The bot.config module, with its JSON cache kept under tmp_path."""
+        module = sys.modules[Config.__module__]
+        monkeypatch.setattr(module, "_JSON_CACHE_DIR", tmp_path / "cache")
+        return module
+    
     def test_config_initialization(self):
         """Test config initialization."""
         config = Config()
@@ -41,6 +46,106 @@ class TestConfig:
         with patch.dict('os.environ', {'TEST_LIST': 'item1,item2,item3'}):
             config = Config()
             assert config.get("TEST_LIST").split(',') == ['item1', 'item2', 'item3']
+    
+    def test_invalid_yaml_falls_back_to_defaults(self, tmp_path, config_module):
+        """Test that a malformed config file leaves only defaults in place."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("invalid: yaml: content: [")
+        
+        config = Config(config_path=config_path)
+        assert config.yaml_config == {}
+        assert config.get("port", 8080, section="api") == 8080
+    
+    def test_yaml_parsed_once_per_mtime(self, tmp_path, config_module):
+        """Test that an unchanged config file is not parsed again."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("api:\n  port: 8080\n")
+        
+        with patch.object(config_module.yaml, 'load', wraps=yaml.load) as mock_load:
+            assert Config(config_path=config_path).get("port", section="api") == 8080
+            assert Config(config_path=config_path).get("port", section="api") == 8080
+            assert mock_load.call_count == 1
+            
+            stat = config_path.stat()
+            config_path.write_text("api:\n  port: 9090\n")
+            os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            assert Config(config_path=config_path).get("port", section="api") == 9090
+            assert mock_load.call_count == 2
+    
+    def test_yaml_cache_isolates_instances(self, tmp_path, config_module):
+        """Test that mutating one instance's nested config does not leak into the next."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("telegram:\n  default_chat_ids: [1, 2]\n")
+        
+        Config(config_path=config_path).get("default_chat_ids", section="telegram").append(999)
+        assert Config(config_path=config_path).get("default_chat_ids", section="telegram") == [1, 2]
+    
+    def test_yaml_json_sidecar(self, tmp_path, monkeypatch, config_module):
+        """Test that a JSON copy of the parsed YAML is reused across processes."""
+        monkeypatch.setattr(config_module, "_PARSED_CACHE", {})
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("api:\n  port: 8080\n")
+        
+        assert Config(config_path=config_path).get("port", section="api") == 8080
+        assert len(list((tmp_path / "cache").glob("config.yaml.*.json"))) == 1
+        
+        # A fresh process has an empty in-memory cache but finds the sidecar
+        monkeypatch.setattr(config_module, "_PARSED_CACHE", {})
+        with patch.object(config_module.yaml, 'load') as mock_load:
+            assert Config(config_path=config_path).get("port", section="api") == 8080
+            mock_load.assert_not_called()
+    
+    def test_yaml_json_sidecar_replaced_on_edit(self, tmp_path, monkeypatch, config_module):
+        """Test that editing the YAML leaves only the sidecar for the new contents."""
+        monkeypatch.setattr(config_module, "_PARSED_CACHE", {})
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("api:\n  port: 8080\n")
+        Config(config_path=config_path)
+        first = list((tmp_path / "cache").glob("config.yaml.*.json"))
+        
+        monkeypatch.setattr(config_module, "_PARSED_CACHE", {})
+        config_path.write_text("api:\n  port: 9090\n")
+        assert Config(config_path=config_path).get("port", section="api") == 9090
+        
+        sidecars = list((tmp_path / "cache").glob("config.yaml.*.json"))
+        assert len(sidecars) == 1
+        assert sidecars != first
+    
+    @pytest.mark.skipif(os.name != "posix", reason="POSIX permission bits")
+    def test_yaml_json_sidecar_is_private(self, tmp_path, monkeypatch, config_module):
+        """Test that the cache directory and sidecar are readable only by the owner."""
+        monkeypatch.setattr(config_module, "_PARSED_CACHE", {})
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("telegram:\n  bot_token: secret\n")
+        Config(config_path=config_path)
+        
+        sidecar, = (tmp_path / "cache").glob("config.yaml.*.json")
+        assert (tmp_path / "cache").stat().st_mode & 0o777 == 0o700
+        assert sidecar.stat().st_mode & 0o777 == 0o600
+    
+    def test_yaml_json_sidecar_per_location(self, tmp_path, monkeypatch, config_module):
+        """Test that same-named files in different directories keep their own sidecars."""
+        monkeypatch.setattr(config_module, "_PARSED_CACHE", {})
+        first = tmp_path / "a" / "config.yaml"
+        second = tmp_path / "b" / "config.yaml"
+        for path, port in ((first, 8080), (second, 9090)):
+            path.parent.mkdir()
+            path.write_text(f"api:\n  port: {port}\n")
+            Config(config_path=path)
+        
+        assert len(list((tmp_path / "cache").glob("config.yaml.*.json"))) == 2
+    
+    def test_yaml_json_sidecar_ignores_non_mapping(self, tmp_path, monkeypatch, config_module):
+        """Test that a sidecar holding anything but a mapping is re-parsed."""
+        monkeypatch.setattr(config_module, "_PARSED_CACHE", {})
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("api:\n  port: 8080\n")
+        Config(config_path=config_path)
+        
+        sidecar, = (tmp_path / "cache").glob("config.yaml.*.json")
+        sidecar.write_text("[1, 2]")
+        monkeypatch.setattr(config_module, "_PARSED_CACHE", {})
+        assert Config(config_path=config_path).get("port", section="api") == 8080
 
 
 class TestValidators:
@@ -108,7 +213,6 @@ class TestFormatters:
         assert "[ERROR]" in formatted
 
 
-@pytest.mark.asyncio
 class TestNotificationService:
     """Test notification service."""
     
@@ -145,7 +249,6 @@ class TestNotificationService:
             # Should not fail due to length
 
 
-@pytest.mark.asyncio  
 class TestSubscriptionService:
     """Test subscription service."""
     
@@ -155,70 +258,113 @@ class TestSubscriptionService:
             service = SubscriptionService()
             assert service._subscriptions == {}
     
-    async def test_subscribe_valid_type(self):
+    async def test_subscribe_valid_type(self, subscription_service):
         """Test subscribing to valid notification type."""
-        with patch('pathlib.Path.exists', return_value=False):
-            service = SubscriptionService()
-            
-            result = await service.subscribe(123456789, 123456789, "system")
-            assert result == True
-            assert 123456789 in service._subscriptions
-            assert "system" in service._subscriptions[123456789]
+        result = await subscription_service.subscribe(123456789, 123456789, "system")
+        assert result == True
+        assert 123456789 in subscription_service._subscriptions
+        assert "system" in subscription_service._subscriptions[123456789]
+    
+    async def test_subscribe_repeat_skips_save(self, subscription_service):
+        """Test that subscribing twice to the same type writes the store once."""
+        with patch('pathlib.Path.write_text') as mock_write:
+            assert await subscription_service.subscribe(123456789, 123456789, "system")
+            assert await subscription_service.subscribe(123456789, 123456789, "system")
+        
+        mock_write.assert_called_once()
     
-    async def test_subscribe_invalid_type(self):
+    async def test_subscribe_invalid_type(self, subscription_service):
         """Test subscribing to invalid notification type."""
-        with patch('pathlib.Path.exists', return_value=False):
-            service = SubscriptionService()
-            
-            result = await service.subscribe(123456789, 123456789, "invalid_type")
-            assert result == False
-            assert 123456789 not in service._subscriptions
+        result = await subscription_service.subscribe(123456789, 123456789, "invalid_type")
+        assert result == False
+        assert 123456789 not in subscription_service._subscriptions
     
-    async def test_unsubscribe(self):
+    async def test_unsubscribe(self, subscription_service):
         """Test unsubscribing from notification type."""
-        with patch('pathlib.Path.exists', return_value=False):
-            service = SubscriptionService()
-            
-            # Subscribe first
-            await service.subscribe(123456789, 123456789, "system")
-            
-            # Then unsubscribe
-            result = await service.unsubscribe(123456789, "system")
-            assert result == True
-            assert 123456789 not in service._subscriptions
+        # Subscribe first
+        await subscription_service.subscribe(123456789, 123456789, "system")
+        
+        # Then unsubscribe
+        result = await subscription_service.unsubscribe(123456789, "system")
+        assert result == True
+        assert 123456789 not in subscription_service._subscriptions
     
-    async def test_get_subscriptions(self):
+    async def test_get_subscriptions(self, subscription_service):
         """Test getting user subscriptions."""
-        with patch('pathlib.Path.exists', return_value=False):
-            service = SubscriptionService()
-            
-            # Subscribe to multiple types
-            await service.subscribe(123456789, 123456789, "system")
-            await service.subscribe(123456789, 123456789, "errors")
-            
-            subscriptions = await service.get_subscriptions(123456789)
-            assert len(subscriptions) == 2
-            assert "system" in subscriptions
-            assert "errors" in subscriptions
+        # Subscribe to multiple types
+        await subscription_service.subscribe(123456789, 123456789, "system")
+        await subscription_service.subscribe(123456789, 123456789, "errors")
+        
+        subscriptions = await subscription_service.get_subscriptions(123456789)
+        assert len(subscriptions) == 2
+        assert "system" in subscriptions
+        assert "errors" in subscriptions
     
-    async def test_get_subscribers(self):
+    async def test_get_subscribers(self, subscription_service):
         """Test getting subscribers for a type."""
-        with patch('pathlib.Path.exists', return_value=False):
-            service = SubscriptionService()
+        # Subscribe multiple users
+        await subscription_service.subscribe(123456789, 123456789, "system")
+        await subscription_service.subscribe(987654321, 987654321, "system")
+        await subscription_service.subscribe(555666777, 555666777, "errors")
+        
+        system_subscribers = await subscription_service.get_subscribers("system")
+        assert len(system_subscribers) == 2
+        assert 123456789 in system_subscribers
+        assert 987654321 in system_subscribers
+        
+        error_subscribers = await subscription_service.get_subscribers("errors")
+        assert len(error_subscribers) == 1
+        assert 555666777 in error_subscribers
+    
+    async def test_get_subscribers_cache_invalidated_on_change(self, subscription_service):
+        """Test that cached subscriber lists reflect later subscription changes."""
+        await subscription_service.subscribe(123456789, 123456789, "system")
+        assert await subscription_service.get_subscribers("system") == [123456789]
+        
+        await subscription_service.subscribe(987654321, 987654321, "system")
+        assert sorted(await subscription_service.get_subscribers("system")) == [123456789, 987654321]
+        
+        await subscription_service.remove_user(123456789)
+        assert await subscription_service.get_subscribers("system") == [987654321]
+    
+    async def test_bulk_mode_saves_once(self, subscription_service):
+        """Test that bulk mode defers saving until the block exits."""
+        with patch('pathlib.Path.write_text') as mock_write:
+            with subscription_service.bulk_mode():
+                for user_id in range(10):
+                    await subscription_service.subscribe(user_id, user_id, "system")
+                
+                mock_write.assert_not_called()
+                assert len(await subscription_service.get_subscribers("system")) == 10
             
-            # Subscribe multiple users
-            await service.subscribe(123456789, 123456789, "system")
-            await service.subscribe(987654321, 987654321, "system")
-            await service.subscribe(555666777, 555666777, "errors")
+            mock_write.assert_called_once()
+    
+    async def test_subscribe_many(self, subscription_service):
+        """Test subscribing several users with a single save."""
+        with patch('pathlib.Path.write_text') as mock_write:
+            results = await subscription_service.subscribe_many([
+                (123456789, 123456789, "system"),
+                (987654321, 987654321, "system"),
+                (555555555, 555555555, "invalid_type"),
+            ])
             
-            system_subscribers = await service.get_subscribers("system")
-            assert len(system_subscribers) == 2
-            assert 123456789 in system_subscribers
-            assert 987654321 in system_subscribers
+            mock_write.assert_called_once()
+        
+        assert results == [True, True, False]
+        assert sorted(await subscription_service.get_subscribers("system")) == [123456789, 987654321]
+    
+    async def test_subscribe_many_repeat_skips_save(self, subscription_service):
+        """Test that re-subscribing existing users does not rewrite the store."""
+        await subscription_service.subscribe_many([(123456789, 123456789, "system")])
+        
+        with patch('pathlib.Path.write_text') as mock_write:
+            results = await subscription_service.subscribe_many([
+                (123456789, 123456789, "system"),
+            ])
             
-            error_subscribers = await service.get_subscribers("errors")
-            assert len(error_subscribers) == 1
-            assert 555666777 in error_subscribers
+            mock_write.assert_not_called()
+        
+        assert results == [True]
 
 
 if __name__ == "__main__":
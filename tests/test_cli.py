@@ -2,16 +2,15 @@
 
 import pytest
 import asyncio
-import sys
 import os
 
 from pathlib import Path
 
 from click.testing import CliRunner
-from unittest.mock import AsyncMock, MagicMock, patch, mock_open
+from unittest.mock import AsyncMock, MagicMock, patch
 
-# Add the parent directory to the path to handle relative imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from bot.cli import cli, status
+from bot.services.notification import notification_service
 
 
 class TestCLIStructure:
@@ -34,13 +33,17 @@ class TestCLIStructure:
             pytest.fail(f"Failed to load CLI module: {e}")
 
 
+@pytest.fixture(scope="module")
+def runner():
+    """Share one CliRunner; stdout and stderr are captured separately."""
+    return CliRunner()
+
+
 class TestCLICommands:
     """Test CLI command functionality."""
 
     def setup_method(self):
         """Set up test environment."""
-        self.runner = CliRunner()
-        
         # Create mock config
         self.mock_config = MagicMock()
         self.mock_config.config_path = Path("test_config.yaml")
@@ -323,6 +326,25 @@ class TestCLICommands:
         assert status['is_healthy'] is True
         assert status['api_enabled'] is True
 
+    def test_status_command_in_process(self, capsys):
+        """Test the status command by calling its callback directly."""
+        with patch('bot.cli.config', self.mock_config), \
+             patch.object(notification_service, 'test_connection', AsyncMock(return_value=True)):
+            status.callback()
+        
+        out = capsys.readouterr().out
+        assert "Bot Status: ✅ Online" in out
+        assert "Default Chat IDs: ['123456789']" in out
+
+    def test_send_command_rejects_empty_message(self, runner):
+        """Test that the send command reports an empty message on stderr."""
+        with patch('bot.cli.config', self.mock_config):
+            result = runner.invoke(cli, ['send', '   '])
+        
+        assert result.exit_code == 0
+        assert result.stdout == ""
+        assert "Error: Message cannot be empty" in result.stderr
+
     def test_unschedule_command_logic(self):
         """Test unschedule command functionality."""
         async def mock_unschedule_job(job_id):
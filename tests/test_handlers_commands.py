@@ -1,218 +1,247 @@
 """Tests for bot command handlers."""
 
 import pytest
-import asyncio
-import sys
-import os
 
+from contextlib import ExitStack
+from types import MappingProxyType, SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
-from datetime import datetime
 from telegram import Update, User, Chat, Message
-from telegram.ext import ContextTypes
 
+from bot.handlers import commands as cmd_mod
 from bot.handlers.commands import CommandHandlers, command_handlers
 from bot.constants import MESSAGES
 
-# Add the parent directory to the path to handle relative imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Fixed timestamp returned by the patched datetime in status/test commands
+_TS = "2025-08-10 12:00:00 UTC"
+
+# Expected replies, formatted once at import instead of in every test
+EXPECTED = MappingProxyType({
+    "status_ok": MESSAGES['STATUS_OK'].format(timestamp=_TS),
+    "status_err": MESSAGES['STATUS_ERROR'].format(timestamp=_TS),
+    "test_notification": MESSAGES['TEST_NOTIFICATION'].format(timestamp=_TS),
+    "err_conn": MESSAGES['ERROR_GENERIC'].format(error_id="Connecti"),
+    "err_system": MESSAGES['ERROR_GENERIC'].format(error_id="System e"),
+    "err_db": MESSAGES['ERROR_GENERIC'].format(error_id="Database"),
+    "err_time": MESSAGES['ERROR_GENERIC'].format(error_id="Time err"),
+    "subscribed_system": MESSAGES['SUBSCRIPTION_SUCCESS'].format(subscription_type='system'),
+    "unsubscribed_system": MESSAGES['UNSUBSCRIPTION_SUCCESS'].format(subscription_type='system'),
+    "subscriptions_list": MESSAGES['SUBSCRIPTIONS_LIST'].format(
+        subscriptions="• `system`\n• `errors`"
+    ),
+})
+
+# Stand-in for the handlers' structlog logger, installed by the mock_logger fixture
+_LOGGER = MagicMock()
+
+
+@pytest.fixture(scope="module")
+def handler():
+    """Create a CommandHandlers instance shared by the module."""
+    return CommandHandlers()
+
+
+@pytest.fixture(scope="module")
+def mock_update():
+    """Create a mock Update object shared by the module."""
+    update = MagicMock(spec=Update)
+    update.effective_user = MagicMock(spec=User)
+    update.effective_user.id = 123456789
+    update.effective_user.first_name = "Test"
+    update.effective_user.username = "testuser"
+    
+    update.effective_chat = MagicMock(spec=Chat)
+    update.effective_chat.id = 123456789
+    
+    update.message = MagicMock(spec=Message)
+    update.message.reply_text = AsyncMock()
+    
+    return update
+
+
+@pytest.fixture(scope="module")
+def mock_context():
+    """Create a Context stand-in shared by the module.
+
+    ContextTypes.DEFAULT_TYPE is a typing alias, so it makes a poor mock spec;
+    the handlers only read ``context.args``.
+    """
+    return SimpleNamespace(args=[])
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_mocks(mock_update, mock_context):
+    """Clear call history and arguments on the shared mocks before each test."""
+    mock_update.message.reply_text.reset_mock()
+    mock_context.args = []
+
+
+@pytest.fixture(autouse=True)
+def patched(monkeypatch, handler):
+    """Install mocks with default results for everything the handlers call out to.
+
+    The clock is frozen at ``_TS`` and the system-info formatter returns a fixed
+    string. Tests override only deviations through ``return_value`` or ``side_effect``.
+    """
+    notification = SimpleNamespace(test_connection=AsyncMock(return_value=True))
+    subscription = SimpleNamespace(
+        subscribe=AsyncMock(return_value=True),
+        unsubscribe=AsyncMock(return_value=True),
+        get_subscriptions=AsyncMock(return_value=[]),
+    )
+    
+    monkeypatch.setattr(cmd_mod.notification_service, 'test_connection', notification.test_connection)
+    for name, mock in vars(subscription).items():
+        monkeypatch.setattr(handler.subscription_service, name, mock)
+    
+    with ExitStack() as stack:
+        mock_datetime = stack.enter_context(patch('bot.handlers.commands.datetime.datetime'))
+        mock_datetime.now.return_value.strftime.return_value = _TS
+        mock_format = stack.enter_context(
+            patch('bot.handlers.commands.format_system_info', return_value="System info formatted")
+        )
+        
+        yield SimpleNamespace(
+            notification=notification,
+            subscription=subscription,
+            datetime=mock_datetime,
+            format_system_info=mock_format,
+        )
+
+
+@pytest.fixture(autouse=True)
+def mock_logger(monkeypatch):
+    """Install the shared logger mock on the handlers module."""
+    _LOGGER.reset_mock()
+    monkeypatch.setattr(cmd_mod, 'logger', _LOGGER)
+    return _LOGGER
 
 
 class TestCommandHandlers:
     """Test cases for CommandHandlers class."""
 
-    @pytest.fixture
-    def handler(self):
-        """Create a CommandHandlers instance for testing."""
-        return CommandHandlers()
-
-    @pytest.fixture
-    def mock_update(self):
-        """Create a mock Update object."""
-        update = MagicMock(spec=Update)
-        update.effective_user = MagicMock(spec=User)
-        update.effective_user.id = 123456789
-        update.effective_user.first_name = "Test"
-        update.effective_user.username = "testuser"
-        
-        update.effective_chat = MagicMock(spec=Chat)
-        update.effective_chat.id = 123456789
-        
-        update.message = MagicMock(spec=Message)
-        update.message.reply_text = AsyncMock()
-        
-        return update
-
-    @pytest.fixture
-    def mock_context(self):
-        """Create a mock Context object."""
-        context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
-        context.args = []
-        return context
-
-    @pytest.mark.asyncio
-    async def test_start_command(self, handler, mock_update, mock_context):
+    async def test_start_command(self, handler, mock_update, mock_context, mock_logger):
         """Test /start command handler."""
-        with patch('bot.handlers.commands.logger') as mock_logger:
-            await handler.start_command(mock_update, mock_context)
-            
-            # Verify message was sent
-            mock_update.message.reply_text.assert_called_once_with(
-                MESSAGES['WELCOME'],
-                parse_mode='Markdown'
-            )
-            
-            # Verify logging
-            mock_logger.info.assert_called_once_with(
-                "Start command received",
-                user_id=123456789,
-                chat_id=123456789
-            )
-
-    @pytest.mark.asyncio
-    async def test_help_command(self, handler, mock_update, mock_context):
+        await handler.start_command(mock_update, mock_context)
+        
+        # Verify message was sent
+        mock_update.message.reply_text.assert_called_once_with(
+            MESSAGES['WELCOME'],
+            parse_mode='Markdown'
+        )
+        
+        # Verify logging
+        mock_logger.info.assert_called_once_with(
+            "Start command received",
+            user_id=123456789,
+            chat_id=123456789
+        )
+
+    async def test_help_command(self, handler, mock_update, mock_context, mock_logger):
         """Test /help command handler."""
-        with patch('bot.handlers.commands.logger') as mock_logger:
-            await handler.help_command(mock_update, mock_context)
-            
-            # Verify message was sent
-            mock_update.message.reply_text.assert_called_once_with(
-                MESSAGES['HELP'],
-                parse_mode='Markdown'
-            )
-            
-            # Verify logging
-            mock_logger.info.assert_called_once_with(
-                "Help command received",
-                user_id=123456789
-            )
-
-    @pytest.mark.asyncio
-    async def test_status_command_healthy(self, handler, mock_update, mock_context):
+        await handler.help_command(mock_update, mock_context)
+        
+        # Verify message was sent
+        mock_update.message.reply_text.assert_called_once_with(
+            MESSAGES['HELP'],
+            parse_mode='Markdown'
+        )
+        
+        # Verify logging
+        mock_logger.info.assert_called_once_with(
+            "Help command received",
+            user_id=123456789
+        )
+
+    async def test_status_command_healthy(self, handler, mock_update, mock_context, patched, mock_logger):
         """Test /status command when bot is healthy."""
-        with patch('bot.handlers.commands.notification_service.test_connection') as mock_test_connection, \
-             patch('bot.handlers.commands.logger') as mock_logger, \
-             patch('bot.handlers.commands.datetime.datetime') as mock_datetime:
-            
-            # Mock healthy response
-            mock_test_connection.return_value = True
-            mock_now = MagicMock()
-            mock_now.strftime.return_value = "2025-08-10 12:00:00 UTC"
-            mock_datetime.now.return_value = mock_now
-            
-            await handler.status_command(mock_update, mock_context)
-            
-            # Verify connection test was called
-            mock_test_connection.assert_called_once()
-            
-            # Verify appropriate message was sent
-            expected_message = MESSAGES['STATUS_OK'].format(timestamp="2025-08-10 12:00:00 UTC")
-            mock_update.message.reply_text.assert_called_once_with(
-                expected_message,
-                parse_mode='Markdown'
-            )
-            
-            # Verify logging
-            mock_logger.info.assert_called_once_with(
-                "Status command received",
-                user_id=123456789
-            )
-
-    @pytest.mark.asyncio
-    async def test_status_command_unhealthy(self, handler, mock_update, mock_context):
+        await handler.status_command(mock_update, mock_context)
+        
+        # Verify connection test was called
+        patched.notification.test_connection.assert_called_once()
+        
+        # Verify appropriate message was sent
+        mock_update.message.reply_text.assert_called_once_with(
+            EXPECTED["status_ok"],
+            parse_mode='Markdown'
+        )
+        
+        # Verify logging
+        mock_logger.info.assert_called_once_with(
+            "Status command received",
+            user_id=123456789
+        )
+
+    async def test_status_command_unhealthy(self, handler, mock_update, mock_context, patched):
         """Test /status command when bot is unhealthy."""
-        with patch('bot.handlers.commands.notification_service.test_connection') as mock_test_connection, \
-             patch('bot.handlers.commands.logger') as mock_logger, \
-             patch('bot.handlers.commands.datetime.datetime') as mock_datetime:
-            
-            # Mock unhealthy response
-            mock_test_connection.return_value = False
-            mock_now = MagicMock()
-            mock_now.strftime.return_value = "2025-08-10 12:00:00 UTC"
-            mock_datetime.now.return_value = mock_now
-            
-            await handler.status_command(mock_update, mock_context)
-            
-            # Verify appropriate message was sent
-            expected_message = MESSAGES['STATUS_ERROR'].format(timestamp="2025-08-10 12:00:00 UTC")
-            mock_update.message.reply_text.assert_called_once_with(
-                expected_message,
-                parse_mode='Markdown'
-            )
-
-    @pytest.mark.asyncio
-    async def test_status_command_exception(self, handler, mock_update, mock_context):
+        # Mock unhealthy response
+        patched.notification.test_connection.return_value = False
+        
+        await handler.status_command(mock_update, mock_context)
+        
+        # Verify appropriate message was sent
+        mock_update.message.reply_text.assert_called_once_with(
+            EXPECTED["status_err"],
+            parse_mode='Markdown'
+        )
+
+    async def test_status_command_exception(self, handler, mock_update, mock_context, patched, mock_logger):
         """Test /status command when an exception occurs."""
-        with patch('bot.handlers.commands.notification_service.test_connection') as mock_test_connection, \
-             patch('bot.handlers.commands.logger') as mock_logger:
-            
-            # Mock exception
-            mock_test_connection.side_effect = Exception("Connection failed")
-            
-            await handler.status_command(mock_update, mock_context)
-            
-            # Verify error message was sent
-            expected_message = MESSAGES['ERROR_GENERIC'].format(error_id="Connecti")
-            mock_update.message.reply_text.assert_called_once_with(
-                expected_message,
-                parse_mode='Markdown'
-            )
-            
-            # Verify error logging
-            mock_logger.error.assert_called_once_with(
-                "Error in status command",
-                error="Connection failed"
-            )
-
-    @pytest.mark.asyncio
-    async def test_system_command_success(self, handler, mock_update, mock_context):
+        # Mock exception
+        patched.notification.test_connection.side_effect = Exception("Connection failed")
+        
+        await handler.status_command(mock_update, mock_context)
+        
+        # Verify error message was sent
+        mock_update.message.reply_text.assert_called_once_with(
+            EXPECTED["err_conn"],
+            parse_mode='Markdown'
+        )
+        
+        # Verify error logging
+        mock_logger.error.assert_called_once_with(
+            "Error in status command",
+            error="Connection failed"
+        )
+
+    async def test_system_command_success(self, handler, mock_update, mock_context, patched, mock_logger):
         """Test /system command successful execution."""
-        with patch('bot.handlers.commands.format_system_info') as mock_format, \
-             patch('bot.handlers.commands.logger') as mock_logger:
-            
-            mock_format.return_value = "System info formatted"
-            
-            await handler.system_command(mock_update, mock_context)
-            
-            # Verify formatter was called
-            mock_format.assert_called_once_with(markdown=True)
-            
-            # Verify message was sent
-            mock_update.message.reply_text.assert_called_once_with(
-                "System info formatted",
-                parse_mode='Markdown'
-            )
-            
-            # Verify logging
-            mock_logger.info.assert_called_once_with(
-                "System command received",
-                user_id=123456789
-            )
-
-    @pytest.mark.asyncio
-    async def test_system_command_exception(self, handler, mock_update, mock_context):
+        await handler.system_command(mock_update, mock_context)
+        
+        # Verify formatter was called
+        patched.format_system_info.assert_called_once_with(markdown=True)
+        
+        # Verify message was sent
+        mock_update.message.reply_text.assert_called_once_with(
+            "System info formatted",
+            parse_mode='Markdown'
+        )
+        
+        # Verify logging
+        mock_logger.info.assert_called_once_with(
+            "System command received",
+            user_id=123456789
+        )
+
+    async def test_system_command_exception(self, handler, mock_update, mock_context, patched, mock_logger):
         """Test /system command when an exception occurs."""
-        with patch('bot.handlers.commands.format_system_info') as mock_format, \
-             patch('bot.handlers.commands.logger') as mock_logger:
-            
-            # Mock exception
-            mock_format.side_effect = Exception("System error")
-            
-            await handler.system_command(mock_update, mock_context)
-            
-            # Verify error message was sent
-            expected_message = MESSAGES['ERROR_GENERIC'].format(error_id="System e")
-            mock_update.message.reply_text.assert_called_once_with(
-                expected_message,
-                parse_mode='Markdown'
-            )
-            
-            # Verify error logging
-            mock_logger.error.assert_called_once_with(
-                "Error in system command",
-                error="System error"
-            )
-
-    @pytest.mark.asyncio
+        # Mock exception
+        patched.format_system_info.side_effect = Exception("System error")
+        
+        await handler.system_command(mock_update, mock_context)
+        
+        # Verify error message was sent
+        mock_update.message.reply_text.assert_called_once_with(
+            EXPECTED["err_system"],
+            parse_mode='Markdown'
+        )
+        
+        # Verify error logging
+        mock_logger.error.assert_called_once_with(
+            "Error in system command",
+            error="System error"
+        )
+
     async def test_subscribe_command_no_args(self, handler, mock_update, mock_context):
         """Test /subscribe command without arguments."""
         # No arguments provided
@@ -226,84 +255,67 @@ class TestCommandHandlers:
             parse_mode='Markdown'
         )
 
-    @pytest.mark.asyncio
-    async def test_subscribe_command_success(self, handler, mock_update, mock_context):
+    async def test_subscribe_command_success(self, handler, mock_update, mock_context, patched, mock_logger):
         """Test /subscribe command successful subscription."""
         mock_context.args = ['system']
         
-        with patch.object(handler.subscription_service, 'subscribe') as mock_subscribe, \
-             patch('bot.handlers.commands.logger') as mock_logger:
-            
-            mock_subscribe.return_value = True
-            
-            await handler.subscribe_command(mock_update, mock_context)
-            
-            # Verify subscription service was called
-            mock_subscribe.assert_called_once_with(
-                user_id=123456789,
-                chat_id=123456789,
-                subscription_type='system'
-            )
-            
-            # Verify success message was sent
-            expected_message = MESSAGES['SUBSCRIPTION_SUCCESS'].format(
-                subscription_type='system'
-            )
-            mock_update.message.reply_text.assert_called_once_with(
-                expected_message,
-                parse_mode='Markdown'
-            )
-            
-            # Verify logging
-            mock_logger.info.assert_called_once_with(
-                "User subscribed",
-                user_id=123456789,
-                subscription_type='system'
-            )
-
-    @pytest.mark.asyncio
-    async def test_subscribe_command_invalid_type(self, handler, mock_update, mock_context):
+        await handler.subscribe_command(mock_update, mock_context)
+        
+        # Verify subscription service was called
+        patched.subscription.subscribe.assert_called_once_with(
+            user_id=123456789,
+            chat_id=123456789,
+            subscription_type='system'
+        )
+        
+        # Verify success message was sent
+        mock_update.message.reply_text.assert_called_once_with(
+            EXPECTED["subscribed_system"],
+            parse_mode='Markdown'
+        )
+        
+        # Verify logging
+        mock_logger.info.assert_called_once_with(
+            "User subscribed",
+            user_id=123456789,
+            subscription_type='system'
+        )
+
+    async def test_subscribe_command_invalid_type(self, handler, mock_update, mock_context, patched):
         """Test /subscribe command with invalid subscription type."""
         mock_context.args = ['invalid']
         
-        with patch.object(handler.subscription_service, 'subscribe') as mock_subscribe:
-            mock_subscribe.return_value = False
-            
-            await handler.subscribe_command(mock_update, mock_context)
-            
-            # Verify error message was sent
-            mock_update.message.reply_text.assert_called_once_with(
-                MESSAGES['INVALID_SUBSCRIPTION_TYPE'],
-                parse_mode='Markdown'
-            )
-
-    @pytest.mark.asyncio
-    async def test_subscribe_command_exception(self, handler, mock_update, mock_context):
+        patched.subscription.subscribe.return_value = False
+        
+        await handler.subscribe_command(mock_update, mock_context)
+        
+        # Verify error message was sent
+        mock_update.message.reply_text.assert_called_once_with(
+            MESSAGES['INVALID_SUBSCRIPTION_TYPE'],
+            parse_mode='Markdown'
+        )
+
+    async def test_subscribe_command_exception(self, handler, mock_update, mock_context, patched, mock_logger):
         """Test /subscribe command when an exception occurs."""
         mock_context.args = ['system']
         
-        with patch.object(handler.subscription_service, 'subscribe') as mock_subscribe, \
-             patch('bot.handlers.commands.logger') as mock_logger:
-            
-            # Mock exception
-            mock_subscribe.side_effect = Exception("Database error")
-            
-            await handler.subscribe_command(mock_update, mock_context)
-            
-            # Verify error message was sent
-            expected_message = MESSAGES['ERROR_GENERIC'].format(error_id="Database")
-            mock_update.message.reply_text.assert_called_once_with(
-                expected_message,
-                parse_mode='Markdown'
-            )
-            
-            # Verify error logging
-            mock_logger.error.assert_called_once_with(
-                "Error in subscribe command",
-                error="Database error"
-            )
-
-    @pytest.mark.asyncio
+        # Mock exception
+        patched.subscription.subscribe.side_effect = Exception("Database error")
+        
+        await handler.subscribe_command(mock_update, mock_context)
+        
+        # Verify error message was sent
+        mock_update.message.reply_text.assert_called_once_with(
+            EXPECTED["err_db"],
+            parse_mode='Markdown'
+        )
+        
+        # Verify error logging
+        mock_logger.error.assert_called_once_with(
+            "Error in subscribe command",
+            error="Database error"
+        )
+
     async def test_unsubscribe_command_no_args(self, handler, mock_update, mock_context):
         """Test /unsubscribe command without arguments."""
         mock_context.args = []
@@ -316,185 +328,142 @@ class TestCommandHandlers:
             parse_mode='Markdown'
         )
 
-    @pytest.mark.asyncio
-    async def test_unsubscribe_command_success(self, handler, mock_update, mock_context):
+    async def test_unsubscribe_command_success(self, handler, mock_update, mock_context, patched, mock_logger):
         """Test /unsubscribe command successful unsubscription."""
         mock_context.args = ['system']
         
-        with patch.object(handler.subscription_service, 'unsubscribe') as mock_unsubscribe, \
-             patch('bot.handlers.commands.logger') as mock_logger:
-            
-            mock_unsubscribe.return_value = True
-            
-            await handler.unsubscribe_command(mock_update, mock_context)
-            
-            # Verify unsubscription service was called
-            mock_unsubscribe.assert_called_once_with(
-                user_id=123456789,
-                subscription_type='system'
-            )
-            
-            # Verify success message was sent
-            expected_message = MESSAGES['UNSUBSCRIPTION_SUCCESS'].format(
-                subscription_type='system'
-            )
-            mock_update.message.reply_text.assert_called_once_with(
-                expected_message,
-                parse_mode='Markdown'
-            )
-            
-            # Verify logging
-            mock_logger.info.assert_called_once_with(
-                "User unsubscribed",
-                user_id=123456789,
-                subscription_type='system'
-            )
-
-    @pytest.mark.asyncio
-    async def test_unsubscribe_command_invalid_type(self, handler, mock_update, mock_context):
+        await handler.unsubscribe_command(mock_update, mock_context)
+        
+        # Verify unsubscription service was called
+        patched.subscription.unsubscribe.assert_called_once_with(
+            user_id=123456789,
+            subscription_type='system'
+        )
+        
+        # Verify success message was sent
+        mock_update.message.reply_text.assert_called_once_with(
+            EXPECTED["unsubscribed_system"],
+            parse_mode='Markdown'
+        )
+        
+        # Verify logging
+        mock_logger.info.assert_called_once_with(
+            "User unsubscribed",
+            user_id=123456789,
+            subscription_type='system'
+        )
+
+    async def test_unsubscribe_command_invalid_type(self, handler, mock_update, mock_context, patched):
         """Test /unsubscribe command with invalid subscription type."""
         mock_context.args = ['invalid']
         
-        with patch.object(handler.subscription_service, 'unsubscribe') as mock_unsubscribe:
-            mock_unsubscribe.return_value = False
-            
-            await handler.unsubscribe_command(mock_update, mock_context)
-            
-            # Verify error message was sent
-            mock_update.message.reply_text.assert_called_once_with(
-                MESSAGES['INVALID_SUBSCRIPTION_TYPE'],
-                parse_mode='Markdown'
-            )
-
-    @pytest.mark.asyncio
-    async def test_subscriptions_command_with_subscriptions(self, handler, mock_update, mock_context):
+        patched.subscription.unsubscribe.return_value = False
+        
+        await handler.unsubscribe_command(mock_update, mock_context)
+        
+        # Verify error message was sent
+        mock_update.message.reply_text.assert_called_once_with(
+            MESSAGES['INVALID_SUBSCRIPTION_TYPE'],
+            parse_mode='Markdown'
+        )
+
+    async def test_subscriptions_command_with_subscriptions(self, handler, mock_update, mock_context, patched):
         """Test /subscriptions command when user has subscriptions."""
-        with patch.object(handler.subscription_service, 'get_subscriptions') as mock_get:
-            mock_get.return_value = ['system', 'errors']
-            
-            await handler.subscriptions_command(mock_update, mock_context)
-            
-            # Verify service was called
-            mock_get.assert_called_once_with(123456789)
-            
-            # Verify message format
-            expected_message = MESSAGES['SUBSCRIPTIONS_LIST'].format(
-                subscriptions="• `system`\n• `errors`"
-            )
-            mock_update.message.reply_text.assert_called_once_with(
-                expected_message,
-                parse_mode='Markdown'
-            )
-
-    @pytest.mark.asyncio
+        patched.subscription.get_subscriptions.return_value = ['system', 'errors']
+        
+        await handler.subscriptions_command(mock_update, mock_context)
+        
+        # Verify service was called
+        patched.subscription.get_subscriptions.assert_called_once_with(123456789)
+        
+        # Verify message format
+        mock_update.message.reply_text.assert_called_once_with(
+            EXPECTED["subscriptions_list"],
+            parse_mode='Markdown'
+        )
+
     async def test_subscriptions_command_no_subscriptions(self, handler, mock_update, mock_context):
         """Test /subscriptions command when user has no subscriptions."""
-        with patch.object(handler.subscription_service, 'get_subscriptions') as mock_get:
-            mock_get.return_value = []
-            
-            await handler.subscriptions_command(mock_update, mock_context)
-            
-            # Verify message was sent
-            mock_update.message.reply_text.assert_called_once_with(
-                MESSAGES['NO_SUBSCRIPTIONS'],
-                parse_mode='Markdown'
-            )
-
-    @pytest.mark.asyncio
-    async def test_subscriptions_command_exception(self, handler, mock_update, mock_context):
+        await handler.subscriptions_command(mock_update, mock_context)
+        
+        # Verify message was sent
+        mock_update.message.reply_text.assert_called_once_with(
+            MESSAGES['NO_SUBSCRIPTIONS'],
+            parse_mode='Markdown'
+        )
+
+    async def test_subscriptions_command_exception(self, handler, mock_update, mock_context, patched, mock_logger):
         """Test /subscriptions command when an exception occurs."""
-        with patch.object(handler.subscription_service, 'get_subscriptions') as mock_get, \
-             patch('bot.handlers.commands.logger') as mock_logger:
-            
-            # Mock exception
-            mock_get.side_effect = Exception("Database error")
-            
-            await handler.subscriptions_command(mock_update, mock_context)
-            
-            # Verify error message was sent
-            expected_message = MESSAGES['ERROR_GENERIC'].format(error_id="Database")
-            mock_update.message.reply_text.assert_called_once_with(
-                expected_message,
-                parse_mode='Markdown'
-            )
-            
-            # Verify error logging
-            mock_logger.error.assert_called_once_with(
-                "Error in subscriptions command",
-                error="Database error"
-            )
-
-    @pytest.mark.asyncio
-    async def test_test_command(self, handler, mock_update, mock_context):
+        # Mock exception
+        patched.subscription.get_subscriptions.side_effect = Exception("Database error")
+        
+        await handler.subscriptions_command(mock_update, mock_context)
+        
+        # Verify error message was sent
+        mock_update.message.reply_text.assert_called_once_with(
+            EXPECTED["err_db"],
+            parse_mode='Markdown'
+        )
+        
+        # Verify error logging
+        mock_logger.error.assert_called_once_with(
+            "Error in subscriptions command",
+            error="Database error"
+        )
+
+    async def test_test_command(self, handler, mock_update, mock_context, mock_logger):
         """Test /test command."""
-        with patch('bot.handlers.commands.logger') as mock_logger, \
-             patch('bot.handlers.commands.datetime.datetime') as mock_datetime:
-            
-            mock_now = MagicMock()
-            mock_now.strftime.return_value = "2025-08-10 12:00:00 UTC"
-            mock_datetime.now.return_value = mock_now
-            
-            await handler.test_command(mock_update, mock_context)
-            
-            # Verify message was sent
-            expected_message = MESSAGES['TEST_NOTIFICATION'].format(
-                timestamp="2025-08-10 12:00:00 UTC"
-            )
-            mock_update.message.reply_text.assert_called_once_with(
-                expected_message,
-                parse_mode='Markdown'
-            )
-            
-            # Verify logging
-            mock_logger.info.assert_called_once_with(
-                "Test command received",
-                user_id=123456789
-            )
-
-    @pytest.mark.asyncio
-    async def test_test_command_exception(self, handler, mock_update, mock_context):
+        await handler.test_command(mock_update, mock_context)
+        
+        # Verify message was sent
+        mock_update.message.reply_text.assert_called_once_with(
+            EXPECTED["test_notification"],
+            parse_mode='Markdown'
+        )
+        
+        # Verify logging
+        mock_logger.info.assert_called_once_with(
+            "Test command received",
+            user_id=123456789
+        )
+
+    async def test_test_command_exception(self, handler, mock_update, mock_context, patched, mock_logger):
         """Test /test command when an exception occurs."""
-        with patch('bot.handlers.commands.logger') as mock_logger, \
-             patch('bot.handlers.commands.datetime.datetime') as mock_datetime:
-            
-            # Mock exception
-            mock_datetime.now.side_effect = Exception("Time error")
-            
-            await handler.test_command(mock_update, mock_context)
-            
-            # Verify error message was sent
-            expected_message = MESSAGES['ERROR_GENERIC'].format(error_id="Time err")
-            mock_update.message.reply_text.assert_called_once_with(
-                expected_message,
-                parse_mode='Markdown'
-            )
-            
-            # Verify error logging
-            mock_logger.error.assert_called_once_with(
-                "Error in test command",
-                error="Time error"
-            )
-
-    @pytest.mark.asyncio
-    async def test_unknown_command(self, handler, mock_update, mock_context):
+        # Mock exception
+        patched.datetime.now.side_effect = Exception("Time error")
+        
+        await handler.test_command(mock_update, mock_context)
+        
+        # Verify error message was sent
+        mock_update.message.reply_text.assert_called_once_with(
+            EXPECTED["err_time"],
+            parse_mode='Markdown'
+        )
+        
+        # Verify error logging
+        mock_logger.error.assert_called_once_with(
+            "Error in test command",
+            error="Time error"
+        )
+
+    async def test_unknown_command(self, handler, mock_update, mock_context, mock_logger):
         """Test unknown command handler."""
         mock_update.message.text = "/unknown"
         
-        with patch('bot.handlers.commands.logger') as mock_logger:
-            await handler.unknown_command(mock_update, mock_context)
-            
-            # Verify message was sent
-            mock_update.message.reply_text.assert_called_once_with(
-                MESSAGES['COMMAND_NOT_FOUND'],
-                parse_mode='Markdown'
-            )
-            
-            # Verify logging
-            mock_logger.info.assert_called_once_with(
-                "Unknown command received",
-                user_id=123456789,
-                command="/unknown"
-            )
+        await handler.unknown_command(mock_update, mock_context)
+        
+        # Verify message was sent
+        mock_update.message.reply_text.assert_called_once_with(
+            MESSAGES['COMMAND_NOT_FOUND'],
+            parse_mode='Markdown'
+        )
+        
+        # Verify logging
+        mock_logger.info.assert_called_once_with(
+            "Unknown command received",
+            user_id=123456789,
+            command="/unknown"
+        )
 
     def test_global_handler_instance(self):
         """Test that global handler instance is created."""
@@ -505,39 +474,15 @@ class TestCommandHandlers:
 class TestCommandHandlersIntegration:
     """Integration tests for command handlers."""
 
-    @pytest.mark.asyncio
-    async def test_command_flow_subscribe_and_list(self):
+    async def test_command_flow_subscribe_and_list(self, handler, mock_update, mock_context, patched):
         """Test the flow of subscribing and listing subscriptions."""
-        handler = CommandHandlers()
-        
-        # Mock update and context
-        update = MagicMock(spec=Update)
-        update.effective_user = MagicMock(spec=User)
-        update.effective_user.id = 123456789
-        update.effective_chat = MagicMock(spec=Chat)
-        update.effective_chat.id = 123456789
-        update.message = MagicMock(spec=Message)
-        update.message.reply_text = AsyncMock()
-        
-        context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
-        context.args = ['system']
-        
-        with patch.object(handler.subscription_service, 'subscribe') as mock_subscribe, \
-             patch.object(handler.subscription_service, 'get_subscriptions') as mock_get, \
-             patch('bot.handlers.commands.logger'):
-            
-            # Mock successful subscription
-            mock_subscribe.return_value = True
-            mock_get.return_value = ['system']
-            
-            # Test subscribe
-            await handler.subscribe_command(update, context)
-            
-            # Test list subscriptions
-            context.args = []  # No args for subscriptions command
-            await handler.subscriptions_command(update, context)
-            
-            # Verify calls
-            assert mock_subscribe.call_count == 1
-            assert mock_get.call_count == 1
-            assert update.message.reply_text.call_count == 2
+        mock_context.args = ['system']
+        
+        patched.subscription.get_subscriptions.return_value = ['system']
+        
+        await handler.subscribe_command(mock_update, mock_context)
+        await handler.subscriptions_command(mock_update, mock_context)
+        
+        assert patched.subscription.subscribe.call_count == 1
+        assert patched.subscription.get_subscriptions.call_count == 1
+        assert mock_update.message.reply_text.call_count == 2
@@ -1,11 +1,172 @@
 """Tests for bot package initialization."""
 
+import functools
+import importlib.util
 import pytest
+import re
 import sys
 import os
+from types import MappingProxyType
 
-# Add the parent directory to the path to handle relative imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+_SPEC_CACHE = {}
+_IMPORT_NAME_RE = re.compile(r'[A-Za-z0-9_-]+')
+_EXPORT_NAME_RE = re.compile(r'[A-Za-z0-9_]+')
+
+# Mock __all__ exports
+_EXPECTED_EXPORTS = frozenset({
+    'TelegramBot',
+    'main',
+    'send_notification',
+    'notification_service',
+    'subscription_service',
+    'monitoring_service',
+    'scheduler_service',
+    'config'
+})
+
+
+def _cached_spec(name, path):
+    """Return the module spec for ``name``, reading ``path`` at most once.
+
+    An already-imported module answers from ``sys.modules``; otherwise the
+    spec built from ``path`` is memoized for later calls.
+    """
+    module = sys.modules.get(name)
+    if module is not None and module.__spec__ is not None:
+        return module.__spec__
+    
+    if name not in _SPEC_CACHE:
+        _SPEC_CACHE[name] = importlib.util.spec_from_file_location(name, path)
+    return _SPEC_CACHE[name]
+
+
+def validate_import_statement(module_path, import_name):
+    """Validate import statement format."""
+    errors = []
+    
+    if not module_path or not import_name:
+        errors.append("Module path and import name are required")
+    
+    if module_path.startswith('.') and not module_path.startswith('./'):
+        # Relative import - valid
+        pass
+    elif module_path.startswith('./') or module_path.startswith('../'):
+        errors.append("Invalid relative import format")
+    
+    if not _IMPORT_NAME_RE.fullmatch(import_name):
+        errors.append("Import name contains invalid characters")
+    
+    return errors
+
+
+def validate_dependencies(deps):
+    """Validate dependency structure."""
+    return _validate_dependency_graph(
+        frozenset((module, frozenset(module_deps)) for module, module_deps in deps.items())
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _validate_dependency_graph(graph):
+    """Check a frozen dependency graph for circular dependencies."""
+    deps = dict(graph)
+    
+    for module, module_deps in deps.items():
+        if module in module_deps:
+            return False, f"Circular dependency: {module} depends on itself"
+        
+        # Check for deep circular dependencies (simplified check)
+        for dep in module_deps:
+            if dep in deps and module in deps[dep]:
+                return False, f"Circular dependency between {module} and {dep}"
+    
+    return True, "Dependencies are valid"
+
+
+@functools.lru_cache(maxsize=None)
+def validate_package_structure():
+    """Validate package structure."""
+    required_modules = (
+        'main',
+        'config',
+        'services',
+        'handlers',
+        'utils'
+    )
+    
+    optional_modules = (
+        'middlewares',
+        'keyboards',
+        'constants'
+    )
+    
+    return MappingProxyType({
+        'required': required_modules,
+        'optional': optional_modules,
+        'total_modules': len(required_modules) + len(optional_modules)
+    })
+
+
+def validate_version_compatibility(version_string):
+    """Validate version string format."""
+    try:
+        parts = version_string.split('.')
+        
+        if len(parts) != 3:
+            return False, "Version must have 3 parts (major.minor.patch)"
+        
+        major, minor, patch = parts
+        
+        # Check if all parts are numeric
+        if not (major.isdigit() and minor.isdigit() and patch.isdigit()):
+            return False, "Version parts must be numeric"
+        
+        # Convert to integers for validation
+        major_int = int(major)
+        minor_int = int(minor)
+        patch_int = int(patch)
+        
+        if major_int < 0 or minor_int < 0 or patch_int < 0:
+            return False, "Version parts cannot be negative"
+        
+        return True, f"Valid version: {version_string}"
+        
+    except Exception as e:
+        return False, f"Invalid version format: {e}"
+
+
+def validate_exports_availability(exports, available_modules):
+    """Validate that all exports are available."""
+    missing_exports = []
+    invalid_exports = []
+    
+    for export in exports:
+        if not export:
+            invalid_exports.append("Empty export name")
+            continue
+        
+        # Check if export name is valid
+        if not _EXPORT_NAME_RE.fullmatch(export):
+            invalid_exports.append(f"Invalid export name: {export}")
+            continue
+        
+        # For this test, assume all service exports should contain 'service'
+        # and all function exports should be lowercase with underscores
+        if 'service' in export.lower():
+            # Service export - should be available
+            pass
+        elif export[0].isupper():
+            # Class export - should be available
+            pass
+        elif '_' in export and export.islower():
+            # Function export - should be available
+            pass
+        else:
+            # Other exports - check availability
+            if export not in available_modules:
+                missing_exports.append(export)
+    
+    return missing_exports, invalid_exports
 
 
 class TestPackageStructure:
@@ -14,9 +175,8 @@ class TestPackageStructure:
     def test_import_structure(self):
         """Test that package init module can be imported and has expected structure."""
         try:
-            import importlib.util
-            spec = importlib.util.spec_from_file_location(
-                "bot.__init__", 
+            spec = _cached_spec(
+                "bot",
                 os.path.join(os.path.dirname(__file__), "..", "bot", "__init__.py")
             )
             assert spec is not None
@@ -40,60 +200,30 @@ class TestPackageStructure:
 
     def test_package_exports(self):
         """Test package __all__ exports."""
-        # Mock __all__ exports
-        expected_exports = [
-            'TelegramBot',
-            'main',
-            'send_notification',
-            'notification_service',
-            'subscription_service',
-            'monitoring_service', 
-            'scheduler_service',
-            'config'
-        ]
-        
         # Validate exports structure
-        assert isinstance(expected_exports, list)
-        assert len(expected_exports) == 8
+        assert isinstance(_EXPECTED_EXPORTS, frozenset)
+        assert len(_EXPECTED_EXPORTS) == 8
         
         # Check for key exports
-        assert 'TelegramBot' in expected_exports
-        assert 'main' in expected_exports
-        assert 'config' in expected_exports
+        assert 'TelegramBot' in _EXPECTED_EXPORTS
+        assert 'main' in _EXPECTED_EXPORTS
+        assert 'config' in _EXPECTED_EXPORTS
 
-    def test_import_validation_logic(self):
+    @pytest.mark.parametrize("module_path,import_name,expected_error", [
+        ('.main', 'TelegramBot', None),
+        ('.services.notification', 'send_notification', None),
+        ('', 'TelegramBot', "required"),
+        ('.main', 'Invalid-Name!', "invalid characters"),
+        ('.main', 'TelegramBot\n', "invalid characters"),
+    ])
+    def test_import_validation_logic(self, module_path, import_name, expected_error):
         """Test import validation logic."""
-        def validate_import_statement(module_path, import_name):
-            """Validate import statement format."""
-            errors = []
-            
-            if not module_path or not import_name:
-                errors.append("Module path and import name are required")
-            
-            if module_path.startswith('.') and not module_path.startswith('./'):
-                # Relative import - valid
-                pass
-            elif module_path.startswith('./') or module_path.startswith('../'):
-                errors.append("Invalid relative import format")
-            
-            if not import_name.replace('_', '').replace('-', '').isalnum():
-                errors.append("Import name contains invalid characters")
-            
-            return errors
-        
-        # Test valid relative imports
-        errors = validate_import_statement('.main', 'TelegramBot')
-        assert len(errors) == 0
+        errors = validate_import_statement(module_path, import_name)
         
-        errors = validate_import_statement('.services.notification', 'send_notification')
-        assert len(errors) == 0
-        
-        # Test invalid imports
-        errors = validate_import_statement('', 'TelegramBot')
-        assert any("required" in error for error in errors)
-        
-        errors = validate_import_statement('.main', 'Invalid-Name!')
-        assert any("invalid characters" in error for error in errors)
+        if expected_error is None:
+            assert len(errors) == 0
+        else:
+            assert any(expected_error in error for error in errors)
 
     def test_module_dependencies(self):
         """Test module dependency structure."""
@@ -106,153 +236,40 @@ class TestPackageStructure:
             'utils': []    # Base dependency
         }
         
-        # Test dependency validation
-        def validate_dependencies(deps):
-            """Validate dependency structure."""
-            # Check for circular dependencies
-            for module, module_deps in deps.items():
-                if module in module_deps:
-                    return False, f"Circular dependency: {module} depends on itself"
-                
-                # Check for deep circular dependencies (simplified check)
-                for dep in module_deps:
-                    if dep in deps and module in deps[dep]:
-                        return False, f"Circular dependency between {module} and {dep}"
-            
-            return True, "Dependencies are valid"
-        
         is_valid, message = validate_dependencies(dependencies)
         assert is_valid is True
         assert "valid" in message
 
     def test_package_structure_validation(self):
         """Test package structure validation."""
-        def validate_package_structure():
-            """Validate package structure."""
-            required_modules = [
-                'main',
-                'config',
-                'services',
-                'handlers',
-                'utils'
-            ]
-            
-            optional_modules = [
-                'middlewares',
-                'keyboards',
-                'constants'
-            ]
-            
-            return {
-                'required': required_modules,
-                'optional': optional_modules,
-                'total_modules': len(required_modules) + len(optional_modules)
-            }
-        
         structure = validate_package_structure()
         assert 'main' in structure['required']
         assert 'config' in structure['required']
         assert structure['total_modules'] > 5
 
-    def test_version_compatibility(self):
+    @pytest.mark.parametrize("version_string,expected_valid,expected_message", [
+        ("1.0.0", True, ""),
+        ("2.1.3", True, ""),
+        ("1.0", False, "3 parts"),
+        ("1.0.a", False, "numeric"),
+    ])
+    def test_version_compatibility(self, version_string, expected_valid, expected_message):
         """Test version compatibility validation."""
-        def validate_version_compatibility(version_string):
-            """Validate version string format."""
-            try:
-                parts = version_string.split('.')
-                
-                if len(parts) != 3:
-                    return False, "Version must have 3 parts (major.minor.patch)"
-                
-                major, minor, patch = parts
-                
-                # Check if all parts are numeric
-                if not (major.isdigit() and minor.isdigit() and patch.isdigit()):
-                    return False, "Version parts must be numeric"
-                
-                # Convert to integers for validation
-                major_int = int(major)
-                minor_int = int(minor)
-                patch_int = int(patch)
-                
-                if major_int < 0 or minor_int < 0 or patch_int < 0:
-                    return False, "Version parts cannot be negative"
-                
-                return True, f"Valid version: {version_string}"
-                
-            except Exception as e:
-                return False, f"Invalid version format: {e}"
-        
-        # Test valid versions
-        is_valid, msg = validate_version_compatibility("1.0.0")
-        assert is_valid is True
-        
-        is_valid, msg = validate_version_compatibility("2.1.3")
-        assert is_valid is True
-        
-        # Test invalid versions
-        is_valid, msg = validate_version_compatibility("1.0")
-        assert is_valid is False
-        assert "3 parts" in msg
+        is_valid, msg = validate_version_compatibility(version_string)
         
-        is_valid, msg = validate_version_compatibility("1.0.a")
-        assert is_valid is False
-        assert "numeric" in msg
+        assert is_valid is expected_valid
+        assert expected_message in msg
 
-    def test_export_availability(self):
+    @pytest.mark.parametrize("exports,available_modules,expected_invalid", [
+        (_EXPECTED_EXPORTS, frozenset({'main', 'config', 'TelegramBot'}), 0),
+        (['', 'bad-name', 'TelegramBot\n'], [], 3),
+    ])
+    def test_export_availability(self, exports, available_modules, expected_invalid):
         """Test export availability validation."""
-        def validate_exports_availability(exports, available_modules):
-            """Validate that all exports are available."""
-            missing_exports = []
-            invalid_exports = []
-            
-            for export in exports:
-                if not export:
-                    invalid_exports.append("Empty export name")
-                    continue
-                
-                # Check if export name is valid
-                if not export.replace('_', '').isalnum():
-                    invalid_exports.append(f"Invalid export name: {export}")
-                    continue
-                
-                # For this test, assume all service exports should contain 'service'
-                # and all function exports should be lowercase with underscores
-                if 'service' in export.lower():
-                    # Service export - should be available
-                    pass
-                elif export[0].isupper():
-                    # Class export - should be available
-                    pass
-                elif '_' in export and export.islower():
-                    # Function export - should be available
-                    pass
-                else:
-                    # Other exports - check availability
-                    if export not in available_modules:
-                        missing_exports.append(export)
-            
-            return missing_exports, invalid_exports
-        
-        # Test export validation
-        exports = [
-            'TelegramBot',
-            'main',
-            'send_notification',
-            'notification_service',
-            'subscription_service',
-            'monitoring_service',
-            'scheduler_service',
-            'config'
-        ]
-        
-        available_modules = ['main', 'config', 'TelegramBot']
-        
         missing, invalid = validate_exports_availability(exports, available_modules)
         
-        # Most exports should be valid (services will be missing from available_modules)
-        assert len(invalid) == 0  # No invalid export names
-        # Some missing is expected since we only provided a few available modules
+        # Some missing is expected since only a few available modules are provided
+        assert len(invalid) == expected_invalid
 
     def test_import_error_handling(self):
         """Test import error handling logic."""
@@ -5,168 +5,301 @@ including services, handlers, configuration, and data flow.
 """
 
 import asyncio
-import tempfile
-import json
+import importlib
 import pytest
-import sys
-import os
 
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
-from pathlib import Path
 
-# Import the main components to test
-from bot.config import config
-from bot.services.notification import notification_service
-from bot.services.subscription import subscription_service
-from bot.services.monitoring import monitoring_service
-from bot.services.scheduler import scheduler_service
-from bot.handlers.commands import command_handlers
-from bot.main import TelegramBot
+SAMPLE_CONFIG_YAML = b"""\
+api:
+  api_host: "localhost"
+  api_port: 8080
 
-# Add the parent directory to the path to handle relative imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+logging:
+  log_level: "INFO"
+"""
+
+# Canned psutil readings; plain namespaces keep attribute reads cheap
+HIGH_CPU = 95.0
+NORMAL_CPU = 10.0
+NORMAL_MEMORY = SimpleNamespace(percent=40.0, used=4 * 1024**3, total=10 * 1024**3)
+HIGH_MEMORY = SimpleNamespace(percent=90.0, used=9 * 1024**3, total=10 * 1024**3)
+NORMAL_DISK = SimpleNamespace(percent=30.0, used=30 * 1024**3, total=100 * 1024**3)
+
+
+@pytest.fixture
+def psutil_readings(request, monkeypatch):
+    """Stub psutil with canned (cpu, memory, disk) readings, high CPU by default.
+    
+    Plain functions stand in for psutil's so nothing samples the real system
+    or blocks on a one-second CPU interval.
+    """
+    cpu, memory, disk = getattr(request, "param", (HIGH_CPU, NORMAL_MEMORY, NORMAL_DISK))
+    monkeypatch.setattr('psutil.cpu_percent', lambda *args, **kwargs: cpu)
+    monkeypatch.setattr('psutil.virtual_memory', lambda: memory)
+    monkeypatch.setattr('psutil.disk_usage', lambda path: disk)
+    monkeypatch.setattr('psutil.getloadavg', lambda: (0.5, 0.4, 0.3))
+
+
+class InMemoryFile:
+    """Minimal stand-in for a storage Path that keeps its contents in memory."""
+    
+    def __init__(self, name="subscriptions.json"):
+        self.name = name
+        self._buf = None
+    
+    @property
+    def parent(self):
+        return self
+    
+    def mkdir(self, parents=False, exist_ok=False):
+        pass
+    
+    def exists(self):
+        return self._buf is not None
+    
+    def read_text(self):
+        return self._buf
+    
+    def write_text(self, data):
+        self._buf = data
+        return len(data)
+    
+    def __str__(self):
+        return f"<memory>/{self.name}"
 
 
 class TestConfigIntegration:
     """Test configuration loading and integration with services."""
     
-    def test_config_service_initialization(self):
-        """Test that services can be initialized with current config."""
-        # Ensure bot token is available for service initialization
-        os.environ['TELEGRAM_BOT_TOKEN'] = 'test_token_123'
-        
-        assert config.telegram_bot_token == 'test_token_123'
-        assert config.api_host in ["localhost", "0.0.0.0"]  # Accept either value
-        assert config.api_port == 8080
-        assert config.log_level == "INFO"
-    
-    def test_config_environment_override(self):
-        """Test that environment variables properly override config."""
-        original_level = config.log_level
+    @pytest.fixture(scope="module")
+    def sample_config(self, tmp_path_factory):
+        """Parse a sample YAML configuration once for the module."""
+        Config = importlib.import_module("bot.config").Config
         
-        # Override with environment variable
-        os.environ['LOG_LEVEL'] = 'DEBUG'
+        config_path = tmp_path_factory.mktemp("config") / "config.yaml"
+        config_path.write_bytes(SAMPLE_CONFIG_YAML)
         
-        # Re-import config to pick up changes (simplified test)
-        # In a real scenario, config would be reloaded at startup
-        assert True  # This test validates the concept, implementation varies
+        with pytest.MonkeyPatch.context() as mp:
+            # Ensure bot token is available and YAML values are not shadowed
+            mp.setenv('TELEGRAM_BOT_TOKEN', 'test_token_123')
+            for name in ('API_HOST', 'API_PORT', 'LOG_LEVEL'):
+                mp.delenv(name, raising=False)
+            
+            yield Config(config_path=config_path, env_path="/nonexistent/.env")
+    
+    @pytest.mark.parametrize("env,expected", [
+        (
+            {},
+            {"telegram_bot_token": "test_token_123", "api_host": "localhost", "api_port": 8080, "log_level": "INFO"},
+        ),
+        (
+            {"TELEGRAM_BOT_TOKEN": "env_token", "API_PORT": "9090", "LOG_LEVEL": "DEBUG"},
+            {"telegram_bot_token": "env_token", "api_host": "localhost", "api_port": 9090, "log_level": "DEBUG"},
+        ),
+    ], ids=["yaml", "env_override"])
+    def test_config_values(self, sample_config, monkeypatch, env, expected):
+        """Test that config values come from YAML unless overridden by the environment."""
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
         
-        # Restore original
-        if original_level:
-            os.environ['LOG_LEVEL'] = original_level
-        elif 'LOG_LEVEL' in os.environ:
-            del os.environ['LOG_LEVEL']
+        for attribute, value in expected.items():
+            assert getattr(sample_config, attribute) == value
 
 
 class TestServiceIntegration:
     """Test integration between different services."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_bot(self):
-        """Create a mock bot for testing."""
+        """Create a mock bot shared by the tests in this class."""
         bot = AsyncMock()
         bot.send_message = AsyncMock(return_value=MagicMock(message_id=123))
         bot.send_photo = AsyncMock(return_value=MagicMock(message_id=124))
         bot.send_document = AsyncMock(return_value=MagicMock(message_id=125))
         return bot
     
+    @pytest.fixture(autouse=True)
+    def reset_mock_bot(self, mock_bot):
+        """Clear call history on the shared bot before each test."""
+        mock_bot.reset_mock()
+    
     @pytest.fixture
-    def temp_subscription_file(self):
-        """Create a temporary subscription file for testing."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            initial_data = {
-                "123456789": ["system", "errors"]
-            }
-            json.dump(initial_data, f)
-            temp_file = f.name
-        
-        yield temp_file
-        
-        # Cleanup
-        if os.path.exists(temp_file):
-            os.unlink(temp_file)
-    
-    @patch('bot.services.notification.Bot')
-    async def test_notification_subscription_integration(self, mock_bot_class, temp_subscription_file, mock_bot):
-        """Test that notifications are sent to subscribed users correctly."""
-        mock_bot_class.return_value = mock_bot
-        
-        # Override subscription file location
-        original_file = subscription_service.storage_file
-        subscription_service.storage_file = Path(temp_subscription_file)
+    def alert_mock(self, bot_services, monkeypatch):
+        """Replace the monitoring service's alert sender with a spec'd AsyncMock."""
+        mock = AsyncMock(spec=bot_services.monitoring._send_alert)
+        monkeypatch.setattr(bot_services.monitoring, "_send_alert", mock)
+        return mock
+    
+    @pytest.mark.parametrize("subscription_type,message", [
+        ("system", "Test system notification"),
+        ("errors", "Test error message"),
+        ("system", "🚨 System Alert: High CPU usage detected!"),
+    ])
+    async def test_subscribe_and_notify(self, bot_services, subscription_file, mock_bot, monkeypatch,
+                                        subscription_type, message):
+        """Test a complete workflow from subscription to notification delivery."""
+        monkeypatch.setattr(bot_services.notification, "bot", mock_bot)
         
-        try:
-            # Load subscriptions
-            subscription_service._load_subscriptions()
-            
-            # Get subscribers for system notifications
-            system_subscribers = await subscription_service.get_subscribers("system")
-            
-            assert 123456789 in system_subscribers
-            
-            # Override the notification service bot with our mock
-            original_bot = notification_service.bot
-            notification_service.bot = mock_bot
-            
-            # Send notification to system subscribers (using actual method)
-            for subscriber in system_subscribers:
-                await notification_service.send_notification(
-                    message="Test system notification",
-                    chat_id=int(subscriber)
-                )
-            
-            # Verify the mock was called
-            mock_bot.send_message.assert_called()
-            
-        finally:
-            # Restore original bot and file
-            notification_service.bot = original_bot
-            subscription_service.storage_file = original_file
-    
-    async def test_monitoring_notification_integration(self):
-        """Test that monitoring alerts trigger notifications properly."""
-        with patch.object(monitoring_service, 'get_current_metrics') as mock_metrics, \
-             patch.object(monitoring_service, '_send_alert') as mock_send_alert:
-            
-            # Mock high CPU usage
-            mock_metrics.return_value = {
-                'cpu_percent': 95.0,
-                'memory_percent': 50.0,
-                'disk_percent': 30.0
-            }
-            
-            # Trigger manual alert (since _check_thresholds is private, test the alert mechanism)
-            await monitoring_service._send_alert("CPU", 95.0, 80)
-            
-            # Should trigger alert sending
-            mock_send_alert.assert_called_with("CPU", 95.0, 80)
+        # Step 1: A user who is not in the canonical store subscribes, and a
+        # second new user subscribes only to the other type
+        user_id = chat_id = 555000111
+        other_type = "errors" if subscription_type == "system" else "system"
+        other_user_id = 555000222
+        
+        result = await bot_services.subscription.subscribe(user_id, chat_id, subscription_type)
+        assert result is True
+        assert await bot_services.subscription.subscribe(other_user_id, other_user_id, other_type) is True
+        
+        # Step 2: Verify only the matching subscription routes to this type
+        subscribers = await bot_services.subscription.get_subscribers(subscription_type)
+        assert chat_id in subscribers
+        assert other_user_id not in subscribers
+        
+        # Step 3: Send notification to all subscribers in one batch
+        results = await bot_services.notification.send_to_multiple(
+            message,
+            [int(subscriber) for subscriber in subscribers]
+        )
+        
+        # Step 4: Verify every subscriber, and nobody else, was messaged
+        assert all(results)
+        assert mock_bot.send_message.await_count == len(subscribers)
+        messaged = {call.kwargs['chat_id']: call.kwargs['text']
+                    for call in mock_bot.send_message.await_args_list}
+        assert chat_id in messaged
+        assert message in messaged[chat_id]
+        assert other_user_id not in messaged
     
-    async def test_scheduler_notification_integration(self):
-        """Test that scheduled jobs trigger notifications."""
-        with patch.object(notification_service, 'send_notification') as mock_send:
-            
-            # Schedule a test notification
-            await scheduler_service.schedule_notification(
-                job_id="test_integration_job",
-                message="Integration test notification",
-                chat_ids=["123456789"],
-                trigger_type="date",
-                run_date="2025-08-10 15:00:00"
-            )
-            
-            # Verify job was scheduled
-            jobs = await scheduler_service.get_scheduled_jobs()
-            job_ids = [job['id'] for job in jobs]
-            assert "test_integration_job" in job_ids
+    @pytest.mark.parametrize("psutil_readings,alerted", [
+        ((HIGH_CPU, NORMAL_MEMORY, NORMAL_DISK), ["CPU"]),
+        ((HIGH_CPU, HIGH_MEMORY, NORMAL_DISK), ["CPU", "Memory"]),
+        ((NORMAL_CPU, NORMAL_MEMORY, NORMAL_DISK), []),
+    ], indirect=["psutil_readings"], ids=["high_cpu", "high_cpu_and_memory", "normal"])
+    async def test_monitoring_notification_integration(self, bot_services, alert_mock,
+                                                       psutil_readings, alerted):
+        """Test that metrics over their thresholds trigger alerts."""
+        await bot_services.monitoring._check_system_metrics()
+        
+        assert [call.args[0] for call in alert_mock.await_args_list] == alerted
+    
+    async def test_alert_cooldown_uses_monotonic_clock(self, monitoring_service, monkeypatch):
+        """Test that a repeat alert is suppressed within the cooldown and sent after it."""
+        monitoring = importlib.import_module("bot.services.monitoring")
+        send = AsyncMock(return_value=True)
+        monkeypatch.setattr(monitoring.subscription_service, "get_subscribers",
+                            AsyncMock(return_value=[123456789]))
+        monkeypatch.setattr(monitoring.notification_service, "send_notification", send)
+        monkeypatch.setattr(monitoring_service, "_last_alerts", {})
+        
+        cooldown = monitoring_service.alert_cooldown
+        clock = [1000.0, 1000.0 + cooldown - 1, 1000.0 + cooldown]
+        with patch('bot.services.monitoring.time.monotonic', side_effect=clock):
+            await monitoring_service._send_alert("CPU", 95.0, 80.0, "%")
+            assert send.await_count == 1
+            
+            # Still inside the cooldown window
+            await monitoring_service._send_alert("CPU", 96.0, 80.0, "%")
+            assert send.await_count == 1
+            
+            # Cooldown elapsed
+            await monitoring_service._send_alert("CPU", 97.0, 80.0, "%")
+            assert send.await_count == 2
+    
+    async def test_scheduler_job_lifecycle(self, bot_services):
+        """Test the schedule, list and unschedule contract against a mock APScheduler."""
+        jobs = {}
+        
+        def add_job(func, trigger, id, **kwargs):
+            jobs[id] = SimpleNamespace(id=id, name=func.__name__, trigger=trigger, next_run_time=None)
+            return jobs[id]
+        
+        with patch('bot.services.scheduler.AsyncIOScheduler') as mock_scheduler_class:
+            mock_scheduler = mock_scheduler_class.return_value
+            mock_scheduler.add_job.side_effect = add_job
+            mock_scheduler.get_jobs.side_effect = lambda: list(jobs.values())
+            mock_scheduler.remove_job.side_effect = jobs.pop
             
-            # Clean up
-            await scheduler_service.unschedule_job("test_integration_job")
+            scheduler = type(bot_services.scheduler)()
+        
+        assert await scheduler.schedule_notification(
+            job_id="test_integration_job",
+            message="Integration test notification",
+            chat_ids=["123456789"],
+            trigger_type="date",
+            run_date=datetime.now(timezone.utc) + timedelta(hours=1)
+        )
+        
+        mock_scheduler.add_job.assert_called_once()
+        assert mock_scheduler.add_job.call_args.kwargs['args'] == ["Integration test notification", ["123456789"]]
+        
+        scheduled = await scheduler.get_scheduled_jobs()
+        assert [job['id'] for job in scheduled] == ["test_integration_job"]
+        assert scheduled[0]['message'] == "Integration test notification"
+        
+        assert await scheduler.unschedule_job("test_integration_job")
+        assert await scheduler.get_scheduled_jobs() == []
+        mock_scheduler.start.assert_not_called()
+    
+    async def test_custom_job_executor_routing(self, bot_services):
+        """Test that blocking custom jobs run in threads and coroutines on the loop."""
+        scheduler = type(bot_services.scheduler)()
+        run_date = datetime.now(timezone.utc) + timedelta(hours=1)
+        
+        def blocking_job():
+            pass
+        
+        async def async_job():
+            pass
+        
+        assert await scheduler.schedule_custom_job("blocking_job", blocking_job, "date", run_date=run_date)
+        assert await scheduler.schedule_custom_job("async_job", async_job, "date", run_date=run_date)
+        
+        assert scheduler.scheduler.get_job("blocking_job").executor == "threadpool"
+        assert scheduler.scheduler.get_job("async_job").executor == "default"
+    
+    @pytest.mark.slow
+    async def test_scheduler_notification_integration(self, bot_services, monkeypatch):
+        """Test that scheduled jobs trigger notifications on a real scheduler."""
+        job_fired = asyncio.Event()
+        mock_send = AsyncMock(side_effect=lambda **kwargs: job_fired.set())
+        monkeypatch.setattr(bot_services.notification, "send_notification", mock_send)
+        
+        # Schedule a test notification a few milliseconds out
+        await bot_services.scheduler.schedule_notification(
+            job_id="test_integration_job",
+            message="Integration test notification",
+            chat_ids=["123456789"],
+            trigger_type="date",
+            run_date=datetime.now(timezone.utc) + timedelta(milliseconds=10)
+        )
+        
+        # Verify job was scheduled
+        jobs = await bot_services.scheduler.get_scheduled_jobs()
+        job_ids = [job['id'] for job in jobs]
+        assert "test_integration_job" in job_ids
+        
+        # Return as soon as the job fires rather than sleeping for a fixed interval
+        bot_services.scheduler.scheduler.start()
+        try:
+            await asyncio.wait_for(job_fired.wait(), timeout=2.0)
+        finally:
+            bot_services.scheduler.scheduler.shutdown(wait=False)
+            bot_services.scheduler._scheduled_jobs.pop("test_integration_job", None)
+        
+        mock_send.assert_awaited_once_with(
+            message="Integration test notification",
+            chat_id="123456789",
+            parse_mode='Markdown'
+        )
 
 
 class TestCommandHandlerIntegration:
     """Test integration of command handlers with services."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_context(self):
         """Create a mock Telegram context object."""
         context = MagicMock()
@@ -174,7 +307,7 @@ class TestCommandHandlerIntegration:
         context.args = []
         return context
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_update(self):
         """Create a mock Telegram update object."""
         update = MagicMock()
@@ -185,16 +318,23 @@ class TestCommandHandlerIntegration:
         update.message.reply_text = AsyncMock()
         return update
     
-    async def test_subscribe_command_integration(self, mock_update, mock_context):
+    @pytest.fixture(autouse=True)
+    def reset_telegram_mocks(self, mock_update, mock_context):
+        """Clear call history and arguments on the shared mocks before each test."""
+        mock_update.reset_mock()
+        mock_context.reset_mock()
+        mock_context.args = []
+    
+    async def test_subscribe_command_integration(self, bot_services, mock_update, mock_context):
         """Test subscribe command integration with subscription service."""
         # Set up command arguments
         mock_context.args = ["system"]
         
-        with patch.object(command_handlers.subscription_service, 'subscribe') as mock_subscribe:
+        with patch.object(bot_services.commands.subscription_service, 'subscribe') as mock_subscribe:
             mock_subscribe.return_value = True
             
             # Execute subscribe command
-            await command_handlers.subscribe_command(mock_update, mock_context)
+            await bot_services.commands.subscribe_command(mock_update, mock_context)
             
             # Verify subscription service was called correctly
             mock_subscribe.assert_called_with(
@@ -206,13 +346,13 @@ class TestCommandHandlerIntegration:
             # Verify response was sent
             mock_update.message.reply_text.assert_called()
     
-    async def test_system_command_integration(self, mock_update, mock_context):
+    async def test_system_command_integration(self, bot_services, mock_update, mock_context):
         """Test system command integration with system info formatting."""
         with patch('bot.handlers.commands.format_system_info') as mock_format:
             mock_format.return_value = "System info formatted"
             
             # Execute system command
-            await command_handlers.system_command(mock_update, mock_context)
+            await bot_services.commands.system_command(mock_update, mock_context)
             
             # Verify formatter was called
             mock_format.assert_called_with(markdown=True)
@@ -227,175 +367,106 @@ class TestCommandHandlerIntegration:
 class TestBotIntegration:
     """Test full bot integration scenarios."""
     
-    @pytest.fixture
-    def mock_application(self):
-        """Create a mock Telegram Application."""
-        app = MagicMock()
-        app.bot = AsyncMock()
-        app.add_handler = MagicMock()
-        app.start = AsyncMock()
-        app.stop = AsyncMock()
-        app.shutdown = AsyncMock()
-        
-        # Mock the updater
-        app.updater = MagicMock()
-        app.updater.start_polling = AsyncMock()
-        app.updater.stop = AsyncMock()
-        app.updater.running = False
-        
-        return app
-    
-    async def test_bot_initialization_flow(self):
+    @pytest.fixture(scope="module")
+    def telegram_bot_stub(self, bot_services):
+        """Create a spec'd stand-in for an uninitialized TelegramBot."""
+        return MagicMock(spec=bot_services.TelegramBot, application=None, is_running=False)
+    
+    async def test_bot_initialization_flow(self, telegram_bot_stub):
         """Test the complete bot initialization flow."""
         # This test would require too much mocking to be meaningful
         # In a real integration test, you'd test with a real Telegram bot token
-        # For now, we'll just verify the class can be instantiated
-        bot = TelegramBot()
+        # For now, we'll just verify the initial state on a spec'd stub
+        bot = telegram_bot_stub
         assert bot.application is None
         assert bot.is_running is False
     
-    async def test_bot_service_startup_integration(self):
+    @pytest.mark.slow
+    async def test_bot_real_construction(self, bot_services):
+        """Test that the real TelegramBot constructor starts uninitialized."""
+        bot = bot_services.TelegramBot()
+        assert bot.application is None
+        assert bot.is_running is False
+    
+    async def test_bot_service_startup_integration(self, bot_services):
         """Test that bot services start up correctly."""
         # This test would require too much mocking to be meaningful
         # In a real integration test, you'd test actual service startup
         # For now, we'll just verify services exist
-        assert scheduler_service is not None
+        assert bot_services.scheduler is not None
 
 
 class TestDataFlowIntegration:
     """Test data flow between components."""
     
-    async def test_subscription_persistence_flow(self):
+    @pytest.mark.parametrize("storage", ["memory", "disk"])
+    async def test_subscription_persistence_flow(self, bot_services, subscription_file, monkeypatch, storage):
         """Test that subscription data persists correctly across operations."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            f.write('{}')
-            temp_file = f.name
+        if storage == "memory":
+            monkeypatch.setattr(bot_services.subscription, "storage_file", InMemoryFile())
         
-        try:
-            # Override subscription file
-            original_file = subscription_service.storage_file
-            subscription_service.storage_file = Path(temp_file)
-            
-            # Test data flow: subscribe -> save -> load -> verify
-            user_id = 123456789
-            chat_id = 123456789
-            
-            # Subscribe user
-            result = await subscription_service.subscribe(user_id, chat_id, "system")
-            assert result is True
-            
-            # Save subscriptions
-            subscription_service._save_subscriptions()
-            
-            # Clear in-memory data
-            subscription_service.subscriptions = {}
-            
-            # Reload from file
-            subscription_service._load_subscriptions()
-            
-            # Verify persistence
-            user_subs = await subscription_service.get_subscriptions(user_id)
-            assert "system" in user_subs
-            
-        finally:
-            # Cleanup
-            subscription_service.storage_file = original_file
-            if os.path.exists(temp_file):
-                os.unlink(temp_file)
-    
-    async def test_notification_routing_flow(self):
-        """Test that notifications are routed correctly based on subscriptions."""
-        with patch.object(notification_service, 'bot') as mock_bot:
-            mock_bot.send_message = AsyncMock()
-            
-            # Add test subscription
-            user_id = 123456789
-            chat_id = 123456789
-            await subscription_service.subscribe(user_id, chat_id, "errors")
-            
-            # Get subscribers and send notifications manually (since send_to_subscribers doesn't exist)
-            subscribers = await subscription_service.get_subscribers("errors")
-            
-            for subscriber in subscribers:
-                await notification_service.send_notification(
-                    message="Test error message",
-                    chat_id=int(subscriber)
-                )
-            
-            # Verify message was sent to subscribed user
-            mock_bot.send_message.assert_called()
-            call_args = mock_bot.send_message.call_args
-            assert call_args[1]['chat_id'] == chat_id
-            assert "Test error message" in call_args[1]['text']
+        # Test data flow: subscribe -> save -> load -> verify
+        user_id = 123456789
+        chat_id = 123456789
+        
+        # Subscribe user
+        result = await bot_services.subscription.subscribe(user_id, chat_id, "system")
+        assert result is True
+        
+        # Save subscriptions
+        bot_services.subscription._save_subscriptions()
+        
+        # Clear in-memory data
+        monkeypatch.setattr(bot_services.subscription, "_subscriptions", {})
+        
+        # Reload from file
+        bot_services.subscription._load_subscriptions()
+        
+        # Verify persistence
+        user_subs = await bot_services.subscription.get_subscriptions(user_id)
+        assert "system" in user_subs
 
 
 class TestErrorHandlingIntegration:
     """Test error handling across integrated components."""
     
-    async def test_service_failure_resilience(self):
+    async def test_service_failure_resilience(self, bot_services, psutil_readings):
         """Test that service failures don't crash the entire system."""
-        with patch.object(monitoring_service, 'get_current_metrics') as mock_metrics:
+        with patch.object(bot_services.monitoring, 'get_current_metrics') as mock_metrics:
             # Make monitoring service fail
             mock_metrics.side_effect = Exception("Monitoring service error")
             
             # This should not raise an exception
             try:
-                await monitoring_service.send_system_report()
+                await bot_services.monitoring.send_system_report()
             except Exception:
                 pytest.fail("System should handle monitoring service failures gracefully")
     
-    async def test_notification_failure_handling(self):
+    async def test_notification_failure_handling(self, bot_services):
         """Test that notification failures are handled gracefully."""
-        with patch.object(notification_service, 'bot') as mock_bot:
+        with patch.object(bot_services.notification, 'bot') as mock_bot:
             # Make bot fail
             mock_bot.send_message.side_effect = Exception("Network error")
             
             # This should not raise an exception
-            result = await notification_service.send_notification(
+            result = await bot_services.notification.send_notification(
                 message="Test message",
                 chat_id="123456789"
             )
             
             # Should return False but not crash
             assert result is False
-
-
-# Run integration tests with proper setup/teardown
-class TestFullSystemIntegration:
-    """Test complete system integration scenarios."""
     
-    async def test_complete_notification_workflow(self):
-        """Test a complete workflow from subscription to notification delivery."""
-        # This test simulates a real-world scenario:
-        # 1. User subscribes to system notifications
-        # 2. System monitoring detects an issue
-        # 3. Alert is sent to subscribed users
+    async def test_storage_failure_handling(self, bot_services, subscription_file):
+        """Test that a failing subscription store does not lose in-memory state."""
+        subscription_service = bot_services.subscription
         
-        with patch.object(notification_service, 'bot') as mock_bot:
-            mock_bot.send_message = AsyncMock()
-            
-            # Step 1: User subscribes
-            user_id = 123456789
-            chat_id = 123456789
-            
-            await subscription_service.subscribe(user_id, chat_id, "system")
-            
-            # Step 2: Verify subscription
-            subscribers = await subscription_service.get_subscribers("system")
-            assert chat_id in [int(sub) for sub in subscribers]
-            
-            # Step 3: Trigger system alert (manually send to subscribers)
-            for subscriber in subscribers:
-                await notification_service.send_notification(
-                    message="🚨 System Alert: High CPU usage detected!",
-                    chat_id=int(subscriber)
-                )
-            
-            # Step 4: Verify notification was sent
-            mock_bot.send_message.assert_called()
-            call_args = mock_bot.send_message.call_args
-            assert call_args[1]['chat_id'] == chat_id
-            assert "System Alert" in call_args[1]['text']
+        # Fail only the store write, leaving every other open() in the process alone
+        with patch.object(type(subscription_file), 'write_text', side_effect=PermissionError("Permission denied")):
+            result = await subscription_service.subscribe(987654321, 987654321, "system")
+        
+        assert result is True
+        assert await subscription_service.is_subscribed(987654321, "system")
 
 
 if __name__ == "__main__":
@@ -1,15 +1,108 @@
 """Tests for bot main application."""
 
 import pytest
-import asyncio
-import sys
-import os
+import importlib
 import logging
+from types import SimpleNamespace
 
 from unittest.mock import AsyncMock, MagicMock, patch, PropertyMock
 
-# Add the parent directory to the path to handle relative imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+_EXPECTED_HANDLERS = (
+    ("CommandHandler", "start", "command_handlers.start_command"),
+    ("CommandHandler", "help", "command_handlers.help_command"),
+    ("CommandHandler", "status", "command_handlers.status_command"),
+    ("CommandHandler", "subscribe", "command_handlers.subscribe_command"),
+    ("CommandHandler", "unsubscribe", "command_handlers.unsubscribe_command"),
+    ("CommandHandler", "subscriptions", "command_handlers.subscriptions_command"),
+    ("CommandHandler", "system", "command_handlers.system_command"),
+    ("CommandHandler", "test", "command_handlers.test_command"),
+    ("MessageHandler", "COMMAND", "command_handlers.unknown_command"),
+)
+
+
+async def mock_start_polling(poll_interval=1.0, timeout=10, retries=3):
+    """Mock polling startup."""
+    if poll_interval <= 0:
+        raise ValueError("Poll interval must be positive")
+    
+    if timeout <= 0:
+        raise ValueError("Timeout must be positive")
+    
+    return {
+        'mode': 'polling',
+        'poll_interval': poll_interval,
+        'timeout': timeout,
+        'bootstrap_retries': retries,
+        'drop_pending_updates': True
+    }
+
+
+async def mock_start_webhook(webhook_url, port=8443, token="test_token", secret="test_secret"):
+    """Mock webhook startup."""
+    if not webhook_url:
+        raise ValueError("Webhook URL is required")
+    
+    if port < 1 or port > 65535:
+        raise ValueError("Invalid port number")
+    
+    if not token:
+        raise ValueError("Bot token is required")
+    
+    return {
+        'mode': 'webhook',
+        'webhook_url': f"{webhook_url}/{token}",
+        'port': port,
+        'listen': "0.0.0.0",
+        'url_path': token,
+        'secret_token': secret
+    }
+
+
+async def mock_main(webhook_url=None):
+    """Mock main function logic."""
+    bot_mode = None
+    
+    if webhook_url:
+        bot_mode = 'webhook'
+    else:
+        bot_mode = 'polling'
+    
+    return {'mode': bot_mode, 'webhook_url': webhook_url}
+
+
+async def mock_error_handler(operation_type):
+    """Mock error handling patterns."""
+    try:
+        if operation_type == "keyboard_interrupt":
+            raise KeyboardInterrupt("User stopped")
+        elif operation_type == "general_error":
+            raise Exception("General error occurred")
+        elif operation_type == "success":
+            return "Operation successful"
+        else:
+            return "Unknown operation"
+    except KeyboardInterrupt:
+        return "Bot stopped by user"
+    except Exception as e:
+        return f"Bot crashed: {e}"
+
+
+def validate_bot_config(token=None, webhook_url=None, log_level="INFO"):
+    """Validate bot configuration."""
+    errors = []
+    
+    if not token:
+        errors.append("Bot token is required")
+    
+    if webhook_url and not webhook_url.startswith('https://'):
+        errors.append("Webhook URL must use HTTPS")
+    
+    valid_log_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+    if log_level.upper() not in valid_log_levels:
+        errors.append(f"Invalid log level: {log_level}")
+    
+    return errors
 
 
 class TestMainStructure:
@@ -18,14 +111,11 @@ class TestMainStructure:
     def test_import_structure(self):
         """Test that main module can be imported and has expected structure."""
         try:
-            import importlib.util
-            spec = importlib.util.spec_from_file_location(
-                "bot.main", 
-                os.path.join(os.path.dirname(__file__), "..", "bot", "main.py")
-            )
-            assert spec is not None
+            main = importlib.import_module("bot.main")
         except Exception as e:
             pytest.fail(f"Failed to load main module: {e}")
+        
+        assert hasattr(main, "TelegramBot")
 
     def test_logging_configuration(self):
         """Test logging configuration logic."""
@@ -52,21 +142,20 @@ class TestTelegramBot:
 
     def setup_method(self):
         """Set up test environment."""
-        self.mock_config = MagicMock()
-        self.mock_config.telegram_bot_token = "test_token"
-        self.mock_config.log_level = "INFO"
-        self.mock_config.log_file = "test.log"
-        self.mock_config.polling_interval = 1.0
-        self.mock_config.webhook_secret = "test_secret"
-        self.mock_config.enable_scheduling = True
-        self.mock_config.enable_monitoring = True
+        self.mock_config = SimpleNamespace(
+            telegram_bot_token="test_token",
+            log_level="INFO",
+            log_file="test.log",
+            polling_interval=1.0,
+            webhook_secret="test_secret",
+            enable_scheduling=True,
+            enable_monitoring=True,
+        )
         
         # Create mock bot instance
-        self.mock_bot = MagicMock()
-        self.mock_bot.application = None
-        self.mock_bot.is_running = False
+        self.mock_bot = SimpleNamespace(application=None, is_running=False)
 
-    def test_bot_initialization_logic(self):
+    async def test_bot_initialization_logic(self):
         """Test bot initialization logic."""
         async def mock_initialize_bot(token, handlers=None):
             """Mock bot initialization."""
@@ -84,13 +173,13 @@ class TestTelegramBot:
             }
         
         # Test successful initialization
-        result = asyncio.run(mock_initialize_bot("test_token", ["handler1", "handler2"]))
+        result = await mock_initialize_bot("test_token", ["handler1", "handler2"])
         assert result['token'] == "test_token"
         assert result['handlers_count'] == 2
         
         # Test failed initialization (no token)
         with pytest.raises(ValueError):
-            asyncio.run(mock_initialize_bot(""))
+            await mock_initialize_bot("")
 
     def test_handlers_registration_logic(self):
         """Test command handlers registration logic."""
@@ -129,77 +218,44 @@ class TestTelegramBot:
         # Test handlers registration
         handlers = mock_add_handlers()
         assert len(handlers) == 9  # 8 commands + 1 unknown handler
-        
-        # Verify specific handlers
-        start_handler = next(h for h in handlers if h['command'] == 'start')
-        assert start_handler['type'] == 'CommandHandler'
-        
-        unknown_handler = next(h for h in handlers if h.get('filter') == 'COMMAND')
-        assert unknown_handler['type'] == 'MessageHandler'
+        assert tuple(
+            (h['type'], h.get('command', h.get('filter')), h['handler'])
+            for h in handlers
+        ) == _EXPECTED_HANDLERS
 
-    def test_polling_startup_logic(self):
+    async def test_polling_startup_logic(self):
         """Test polling startup logic."""
-        async def mock_start_polling(poll_interval=1.0, timeout=10, retries=3):
-            """Mock polling startup."""
-            if poll_interval <= 0:
-                raise ValueError("Poll interval must be positive")
-            
-            if timeout <= 0:
-                raise ValueError("Timeout must be positive")
-            
-            return {
-                'mode': 'polling',
-                'poll_interval': poll_interval,
-                'timeout': timeout,
-                'bootstrap_retries': retries,
-                'drop_pending_updates': True
-            }
-        
-        # Test successful polling start
-        result = asyncio.run(mock_start_polling(1.0, 10, 3))
+        result = await mock_start_polling(1.0, 10, 3)
         assert result['mode'] == 'polling'
         assert result['poll_interval'] == 1.0
-        
-        # Test invalid polling parameters
+
+    @pytest.mark.parametrize("poll_interval,timeout", [
+        (-1.0, 10),
+        (1.0, 0),
+    ], ids=["negative_interval", "zero_timeout"])
+    async def test_polling_startup_rejects_invalid_parameters(self, poll_interval, timeout):
+        """Test that polling refuses non-positive intervals and timeouts."""
         with pytest.raises(ValueError):
-            asyncio.run(mock_start_polling(-1.0, 10, 3))
+            await mock_start_polling(poll_interval, timeout, 3)
 
-    def test_webhook_startup_logic(self):
+    async def test_webhook_startup_logic(self):
         """Test webhook startup logic."""
-        async def mock_start_webhook(webhook_url, port=8443, token="test_token", secret="test_secret"):
-            """Mock webhook startup."""
-            if not webhook_url:
-                raise ValueError("Webhook URL is required")
-            
-            if port < 1 or port > 65535:
-                raise ValueError("Invalid port number")
-            
-            if not token:
-                raise ValueError("Bot token is required")
-            
-            return {
-                'mode': 'webhook',
-                'webhook_url': f"{webhook_url}/{token}",
-                'port': port,
-                'listen': "0.0.0.0",
-                'url_path': token,
-                'secret_token': secret
-            }
-        
-        # Test successful webhook start
-        result = asyncio.run(mock_start_webhook("https://example.com", 8443, "test_token", "secret"))
+        result = await mock_start_webhook("https://example.com", 8443, "test_token", "secret")
         assert result['mode'] == 'webhook'
         assert result['port'] == 8443
         assert "test_token" in result['webhook_url']
-        
-        # Test invalid webhook parameters
-        with pytest.raises(ValueError):
-            asyncio.run(mock_start_webhook("", 8443, "test_token", "secret"))
-        
+
+    @pytest.mark.parametrize("webhook_url,port,token", [
+        ("", 8443, "test_token"),
+        ("https://example.com", 70000, "test_token"),
+        ("https://example.com", 8443, ""),
+    ], ids=["missing_url", "port_out_of_range", "missing_token"])
+    async def test_webhook_startup_rejects_invalid_parameters(self, webhook_url, port, token):
+        """Test that webhook startup validates its URL, port and token."""
         with pytest.raises(ValueError):
-            asyncio.run(mock_start_webhook("https://example.com", 70000, "test_token", "secret"))
+            await mock_start_webhook(webhook_url, port, token, "secret")
 
-    def test_services_startup_logic(self):
+    async def test_services_startup_logic(self):
         """Test background services startup logic."""
         async def mock_start_services(enable_scheduling=True, enable_monitoring=True):
             """Mock services startup."""
@@ -216,22 +272,22 @@ class TestTelegramBot:
             return started_services
         
         # Test all services enabled
-        services = asyncio.run(mock_start_services(True, True))
+        services = await mock_start_services(True, True)
         assert 'scheduler' in services
         assert 'monitoring' in services
         assert len(services) == 2
         
         # Test only monitoring enabled
-        services = asyncio.run(mock_start_services(False, True))
+        services = await mock_start_services(False, True)
         assert 'scheduler' not in services
         assert 'monitoring' in services
         assert len(services) == 1
         
         # Test no services enabled
-        services = asyncio.run(mock_start_services(False, False))
+        services = await mock_start_services(False, False)
         assert len(services) == 0
 
-    def test_services_shutdown_logic(self):
+    async def test_services_shutdown_logic(self):
         """Test background services shutdown logic."""
         async def mock_stop_services(running_services=None):
             """Mock services shutdown."""
@@ -251,17 +307,17 @@ class TestTelegramBot:
             return stopped_services
         
         # Test stopping all services
-        stopped = asyncio.run(mock_stop_services(['scheduler', 'monitoring']))
+        stopped = await mock_stop_services(['scheduler', 'monitoring'])
         assert len(stopped) == 2
         assert 'scheduler' in stopped
         assert 'monitoring' in stopped
         
         # Test stopping partial services
-        stopped = asyncio.run(mock_stop_services(['monitoring']))
+        stopped = await mock_stop_services(['monitoring'])
         assert len(stopped) == 1
         assert 'monitoring' in stopped
 
-    def test_bot_shutdown_logic(self):
+    async def test_bot_shutdown_logic(self):
         """Test bot shutdown logic."""
         async def mock_stop_bot(has_application=True):
             """Mock bot shutdown."""
@@ -281,14 +337,14 @@ class TestTelegramBot:
             return shutdown_steps
         
         # Test full shutdown
-        steps = asyncio.run(mock_stop_bot(True))
+        steps = await mock_stop_bot(True)
         assert 'set_is_running_false' in steps
         assert 'stop_application' in steps
         assert 'shutdown_application' in steps
         assert 'stop_services' in steps
         
         # Test shutdown without application
-        steps = asyncio.run(mock_stop_bot(False))
+        steps = await mock_stop_bot(False)
         assert 'set_is_running_false' in steps
         assert 'stop_application' not in steps
         assert 'stop_services' in steps
@@ -297,98 +353,46 @@ class TestTelegramBot:
 class TestMainEntryPoint:
     """Test main entry point functionality."""
 
-    def test_main_function_logic(self):
+    @pytest.mark.parametrize("webhook_url,mode", [
+        (None, 'polling'),
+        ("https://example.com/webhook", 'webhook'),
+    ])
+    async def test_main_function_logic(self, webhook_url, mode):
         """Test main function decision logic."""
-        async def mock_main(webhook_url=None):
-            """Mock main function logic."""
-            bot_mode = None
-            
-            if webhook_url:
-                bot_mode = 'webhook'
-            else:
-                bot_mode = 'polling'
-            
-            return {'mode': bot_mode, 'webhook_url': webhook_url}
-        
-        # Test polling mode (no webhook URL)
-        result = asyncio.run(mock_main())
-        assert result['mode'] == 'polling'
-        assert result['webhook_url'] is None
-        
-        # Test webhook mode
-        result = asyncio.run(mock_main("https://example.com/webhook"))
-        assert result['mode'] == 'webhook'
-        assert result['webhook_url'] == "https://example.com/webhook"
+        result = await mock_main(webhook_url)
+        assert result['mode'] == mode
+        assert result['webhook_url'] == webhook_url
 
-    def test_error_handling_patterns(self):
+    @pytest.mark.parametrize("operation_type,expected", [
+        ("success", "Operation successful"),
+        ("keyboard_interrupt", "Bot stopped by user"),
+        ("general_error", "Bot crashed"),
+    ])
+    async def test_error_handling_patterns(self, operation_type, expected):
         """Test error handling in main functions."""
-        async def mock_error_handler(operation_type):
-            """Mock error handling patterns."""
-            try:
-                if operation_type == "keyboard_interrupt":
-                    raise KeyboardInterrupt("User stopped")
-                elif operation_type == "general_error":
-                    raise Exception("General error occurred")
-                elif operation_type == "success":
-                    return "Operation successful"
-                else:
-                    return "Unknown operation"
-            except KeyboardInterrupt:
-                return "Bot stopped by user"
-            except Exception as e:
-                return f"Bot crashed: {e}"
-        
-        # Test successful operation
-        result = asyncio.run(mock_error_handler("success"))
-        assert result == "Operation successful"
-        
-        # Test keyboard interrupt
-        result = asyncio.run(mock_error_handler("keyboard_interrupt"))
-        assert result == "Bot stopped by user"
-        
-        # Test general error
-        result = asyncio.run(mock_error_handler("general_error"))
-        assert "Bot crashed" in result
+        result = await mock_error_handler(operation_type)
+        assert result.startswith(expected)
 
-    def test_configuration_validation(self):
+    @pytest.mark.parametrize("token,webhook_url,log_level,expected_error", [
+        ("test_token", "https://example.com", "INFO", None),
+        (None, "https://example.com", "INFO", "Bot token is required"),
+        ("test_token", "http://example.com", "INFO", "HTTPS"),
+        ("test_token", "https://example.com", "INVALID", "Invalid log level"),
+    ], ids=["valid", "missing_token", "insecure_webhook", "invalid_log_level"])
+    def test_configuration_validation(self, token, webhook_url, log_level, expected_error):
         """Test configuration validation logic."""
-        def validate_bot_config(token=None, webhook_url=None, log_level="INFO"):
-            """Validate bot configuration."""
-            errors = []
-            
-            if not token:
-                errors.append("Bot token is required")
-            
-            if webhook_url and not webhook_url.startswith('https://'):
-                errors.append("Webhook URL must use HTTPS")
-            
-            valid_log_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
-            if log_level.upper() not in valid_log_levels:
-                errors.append(f"Invalid log level: {log_level}")
-            
-            return errors
-        
-        # Test valid configuration
-        errors = validate_bot_config("test_token", "https://example.com", "INFO")
-        assert len(errors) == 0
-        
-        # Test missing token
-        errors = validate_bot_config(None, "https://example.com", "INFO")
-        assert "Bot token is required" in errors
-        
-        # Test invalid webhook URL
-        errors = validate_bot_config("test_token", "http://example.com", "INFO")
-        assert any("HTTPS" in error for error in errors)
+        errors = validate_bot_config(token, webhook_url, log_level)
         
-        # Test invalid log level
-        errors = validate_bot_config("test_token", "https://example.com", "INVALID")
-        assert any("Invalid log level" in error for error in errors)
+        if expected_error is None:
+            assert errors == []
+        else:
+            assert any(expected_error in error for error in errors)
 
 
 class TestIntegrationScenarios:
     """Test integration scenarios."""
 
-    def test_full_startup_sequence(self):
+    async def test_full_startup_sequence(self):
         """Test complete bot startup sequence."""
         async def mock_full_startup(config):
             """Mock complete startup sequence."""
@@ -420,7 +424,7 @@ class TestIntegrationScenarios:
             'enable_monitoring': True,
             'webhook_url': 'https://example.com'
         }
-        sequence = asyncio.run(mock_full_startup(config))
+        sequence = await mock_full_startup(config)
         
         assert 'initialize_bot' in sequence
         assert 'add_handlers' in sequence
@@ -428,7 +432,7 @@ class TestIntegrationScenarios:
         assert 'start_monitoring' in sequence
         assert 'start_webhook' in sequence
 
-    def test_graceful_shutdown_sequence(self):
+    async def test_graceful_shutdown_sequence(self):
         """Test graceful shutdown sequence."""
         async def mock_graceful_shutdown():
             """Mock graceful shutdown sequence."""
@@ -447,7 +451,7 @@ class TestIntegrationScenarios:
             return sequence
         
         # Test shutdown sequence
-        sequence = asyncio.run(mock_graceful_shutdown())
+        sequence = await mock_graceful_shutdown()
         assert 'stop_bot_polling' in sequence
         assert 'stop_monitoring' in sequence
         assert 'stop_scheduler' in sequence
@@ -2,73 +2,70 @@
 
 import pytest
 import asyncio
+import importlib
 import time
+import timeit
 import sys
-import os
 
-from unittest.mock import Mock, AsyncMock, patch
+from unittest.mock import patch
 
-from bot.services.notification import NotificationService
-from bot.services.subscription import SubscriptionService
-from bot.utils.formatters import format_message, format_system_info
 
-# Add the parent directory to the path to handle relative imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+@pytest.fixture(scope="module")
+def format_message():
+    """Import the formatter on first use so collecting this module stays cheap.
+    
+    Any ``bot`` import pulls in the whole service graph through the package
+    ``__init__``; deferring it means ``-k`` runs that skip these tests never
+    pay for it.
+    """
+    return importlib.import_module("bot.utils.formatters").format_message
+
 
 class TestNotificationPerformance:
     """Test notification service performance."""
     
-    @pytest.mark.asyncio
-    async def test_bulk_notification_performance(self):
+    async def test_bulk_notification_performance(self, notification_service):
         """Test performance of sending notifications to multiple users."""
-        notification_service = NotificationService()
+        # Test sending to 100 users
+        chat_ids = [f"user_{i}" for i in range(100)]
+        message = "Test message"
         
-        # Mock the telegram bot
-        with patch.object(notification_service, 'bot') as mock_bot:
-            mock_bot.send_message = AsyncMock(return_value=True)
-            
-            # Test sending to 100 users
-            chat_ids = [f"user_{i}" for i in range(100)]
-            message = "Test message"
-            
-            start_time = time.time()
-            
-            # Use gather for concurrent sends
-            tasks = [
-                notification_service.send_notification(message, chat_id)
-                for chat_id in chat_ids
-            ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            end_time = time.time()
-            duration = end_time - start_time
-            
-            # Should complete within reasonable time (5 seconds for 100 messages)
-            assert duration < 5.0
-            
-            # All should succeed (in mock)
-            successful = sum(1 for result in results if result is True)
-            assert successful == len(chat_ids)
+        start_time = time.time()
+        
+        # Use gather for concurrent sends
+        tasks = [
+            notification_service.send_notification(message, chat_id)
+            for chat_id in chat_ids
+        ]
+        results = await asyncio.gather(*tasks)
+        
+        end_time = time.time()
+        duration = end_time - start_time
+        
+        # Should complete within reasonable time (5 seconds for 100 messages)
+        assert duration < 5.0
+        
+        # All should succeed (in mock)
+        successful = results.count(True)
+        assert successful == len(chat_ids)
     
-    @pytest.mark.asyncio
-    async def test_message_formatting_performance(self):
+    def test_message_formatting_performance(self, format_message):
         """Test message formatting performance."""
         # Test formatting 1000 messages
         message_count = 1000
         
-        start_time = time.time()
-        
-        for i in range(message_count):
-            formatted = format_message(
-                title=f"Message {i}",
-                message=f"This is test message number {i}",
+        def format_one():
+            return format_message(
+                title="Message",
+                message="This is a test message",
                 level="INFO",
                 markdown=True
             )
-            assert len(formatted) > 0
         
-        end_time = time.time()
-        duration = end_time - start_time
+        assert len(format_one()) > 0
+        
+        # timeit runs the calls in its own tight loop, so the harness adds little to the measurement
+        duration = timeit.Timer(format_one).timeit(number=message_count)
         
         # Should format messages quickly (< 1 second for 1000 messages)
         assert duration < 1.0
@@ -81,19 +78,12 @@ class TestNotificationPerformance:
 class TestSubscriptionPerformance:
     """Test subscription service performance."""
     
-    @pytest.mark.asyncio
-    async def test_subscription_lookup_performance(self):
+    @pytest.mark.perf
+    async def test_subscription_lookup_performance(self, subscription_service):
         """Test performance of subscription lookups."""
-        subscription_service = SubscriptionService()
-        subscription_service._subscriptions = {}  # Clear existing subscriptions
-        
-        # Add many subscribers
+        # Seed many subscribers directly; only the lookups are under test
         subscriber_count = 1000
-        topic = "test_topic"
-        
-        # Add subscribers
-        for i in range(subscriber_count):
-            await subscription_service.subscribe(i, 123456, "system")
+        subscription_service._subscriptions = {i: {"system"} for i in range(subscriber_count)}
         
         # Test lookup performance
         start_time = time.time()
@@ -108,58 +98,82 @@ class TestSubscriptionPerformance:
         # Should be fast (< 0.1 seconds for 100 lookups)
         assert duration < 0.1
     
-    @pytest.mark.asyncio 
-    async def test_subscription_modification_performance(self):
-        """Test performance of subscription modifications."""
-        subscription_service = SubscriptionService()
+    async def test_bulk_subscribe_performance(self, subscription_service):
+        """Test that bulk subscriptions across topics persist with a single write."""
+        user_count = 1000
+        topics = ["system", "errors", "events", "scheduled"]
+        
+        start_time = time.time()
         
+        with patch.object(type(subscription_service.storage_file), 'write_text') as mock_write:
+            results = await subscription_service.subscribe_many([
+                (i, 123456, topics[i % len(topics)]) for i in range(user_count)
+            ])
+        
+        duration = time.time() - start_time
+        
+        assert results.count(True) == user_count
+        mock_write.assert_called_once()
+        for topic in topics:
+            assert len(await subscription_service.get_subscribers(topic)) == user_count // len(topics)
+        
+        # Should be fast (< 0.5 seconds for 1000 subscriptions)
+        assert duration < 0.5
+    
+    @pytest.mark.perf
+    async def test_subscription_modification_performance(self, subscription_service):
+        """Test performance of subscription modifications."""
         operation_count = 1000
         topic = "performance_test"
         
         start_time = time.time()
         
-        # Test subscribe/unsubscribe cycles
-        for i in range(operation_count):
-            user_id = i % 100  # Reuse users, use integers
-            
-            await subscription_service.subscribe(user_id, 123456, "system")
-            
-            if i % 2 == 0:  # Unsubscribe every other
-                await subscription_service.unsubscribe(user_id, "system")
+        # Test subscribe/unsubscribe cycles, saving the store once at the end.
+        # These coroutines never yield and share one unlocked dict, so they
+        # stay serial; gathering them would only add task overhead.
+        with subscription_service.bulk_mode():
+            for i in range(operation_count):
+                user_id = i % 100  # Reuse users, use integers
+                
+                await subscription_service.subscribe(user_id, 123456, "system")
+                
+                if i % 2 == 0:  # Unsubscribe every other
+                    await subscription_service.unsubscribe(user_id, "system")
         
         end_time = time.time()
         duration = end_time - start_time
         
-        # Should complete within reasonable time (very relaxed timing for test environment)
-        assert duration < 45.0  # Increased from 15.0 to 45.0 seconds to account for slower environments
+        # Should complete within reasonable time
+        assert duration < 15.0
         
         operations_per_second = operation_count / duration
-        assert operations_per_second > 20  # Decreased from 50 to 20 ops/second for more realistic expectations
+        assert operations_per_second > 50
 
 
 class TestMemoryUsage:
     """Test memory usage patterns."""
     
-    def test_message_caching_memory(self):
+    def test_message_caching_memory(self, format_message):
         """Test memory usage of message caching."""
-        import sys
-        
-        # Test that message formatting doesn't leak memory
-        initial_size = sys.getsizeof({})
+        import tracemalloc
         
-        message_cache = {}
-        
-        # Add many formatted messages
-        for i in range(1000):
-            key = f"message_{i}"
-            message_cache[key] = format_message(
-                title=f"Title {i}",
-                message=f"Message {i}",
-                level="INFO"
-            )
+        # Trace only the cache build; sys.getsizeof would count the dict
+        # slots but not the key and message strings they point to
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            message_cache = {
+                f"message_{i}": format_message(
+                    title=f"Title {i}",
+                    message=f"Message {i}",
+                    level="INFO"
+                )
+                for i in range(1000)
+            }
+            cache_size = tracemalloc.get_traced_memory()[0] - baseline
+        finally:
+            tracemalloc.stop()
         
-        # Check cache size is reasonable
-        cache_size = sys.getsizeof(message_cache)
         average_message_size = cache_size / len(message_cache)
         
         # Average message should be < 1KB
@@ -169,29 +183,27 @@ class TestMemoryUsage:
         message_cache.clear()
         assert len(message_cache) == 0
     
-    def test_subscription_storage_efficiency(self):
+    def test_subscription_storage_efficiency(self, subscription_service):
         """Test subscription storage efficiency."""
-        subscription_service = SubscriptionService()
-        subscription_service._subscriptions = {}  # Clear any existing subscriptions
-        
         # Add many subscriptions
         user_count = 1000
         topics_per_user = 5
         
-        for user_i in range(user_count):
-            for topic_i in range(topics_per_user):
-                subscription_service._subscriptions.setdefault(user_i, set()).add(f"topic_{topic_i}")
+        # Format the topic names once; each user still gets its own set
+        topics = frozenset(f"topic_{topic_i}" for topic_i in range(topics_per_user))
+        subscription_service._subscriptions = {
+            user_i: set(topics) for user_i in range(user_count)
+        }
         
         # Check storage efficiency
         total_subscriptions = user_count * topics_per_user
         storage = subscription_service._subscriptions
         
         # Verify data integrity
-        actual_subscriptions = sum(len(topics) for topics in storage.values())
+        actual_subscriptions = sum(len(user_topics) for user_topics in storage.values())
         assert actual_subscriptions == total_subscriptions
         
         # Memory usage should be reasonable
-        import sys
         storage_size = sys.getsizeof(storage)
         bytes_per_subscription = storage_size / total_subscriptions
         
@@ -202,44 +214,41 @@ class TestMemoryUsage:
 class TestConcurrencyPerformance:
     """Test performance under concurrent load."""
     
-    @pytest.mark.asyncio
-    async def test_concurrent_message_sending(self):
+    async def test_concurrent_message_sending(self, notification_service):
         """Test concurrent message sending performance."""
-        notification_service = NotificationService()
+        # Create many concurrent tasks
+        task_count = 50
+        concurrent_users = 10
         
-        with patch.object(notification_service, 'bot') as mock_bot:
-            mock_bot.send_message = AsyncMock(return_value=True)
-            
-            # Create many concurrent tasks
-            task_count = 50
-            concurrent_users = 10
-            
-            async def send_messages():
-                tasks = []
-                for i in range(task_count):
-                    chat_id = f"user_{i % concurrent_users}"
-                    message = f"Concurrent message {i}"
-                    task = notification_service.send_notification(message, chat_id)
-                    tasks.append(task)
-                
-                return await asyncio.gather(*tasks, return_exceptions=True)
-            
-            start_time = time.time()
-            results = await send_messages()
-            end_time = time.time()
-            
-            duration = end_time - start_time
-            
-            # Should handle concurrent load efficiently
-            assert duration < 2.0
-            
-            # All tasks should complete successfully
-            successful = sum(1 for result in results if result is True)
-            assert successful == task_count
+        # Only concurrent_users distinct chat IDs exist, so build them once
+        chat_ids = [f"user_{u}" for u in range(concurrent_users)]
+        messages = [f"Concurrent message {i}" for i in range(task_count)]
+        
+        async def send_messages():
+            tasks = [
+                notification_service.send_notification(message, chat_ids[i % concurrent_users])
+                for i, message in enumerate(messages)
+            ]
+            return await asyncio.gather(*tasks)
+        
+        start_time = time.time()
+        results = await send_messages()
+        end_time = time.time()
+        
+        duration = end_time - start_time
+        
+        # Should handle concurrent load efficiently
+        assert duration < 2.0
+        
+        # All tasks should complete successfully
+        successful = results.count(True)
+        assert successful == task_count
     
-    @pytest.mark.asyncio
     async def test_service_startup_performance(self):
         """Test service initialization performance."""
+        from bot.services.notification import NotificationService
+        from bot.services.subscription import SubscriptionService
+        
         start_time = time.time()
         
         # Initialize services
@@ -258,19 +267,26 @@ class TestConcurrencyPerformance:
 class TestSystemResourceUsage:
     """Test system resource usage."""
     
-    def test_cpu_usage_monitoring(self):
+    @pytest.mark.perf
+    def test_cpu_usage_monitoring(self, format_message):
         """Test CPU usage during intensive operations."""
         import psutil
         import threading
         
         # Monitor CPU during intensive task
         cpu_usage = []
-        monitoring = True
+        min_samples = 3
+        stop_monitoring = threading.Event()
+        sampled = threading.Event()
+        
+        # Prime psutil's counters; each later non-blocking call reports usage since the previous one
+        psutil.cpu_percent(interval=None)
         
         def monitor_cpu():
-            while monitoring:
-                cpu_usage.append(psutil.cpu_percent(interval=0.1))
-                time.sleep(0.1)
+            while not stop_monitoring.wait(0.05):
+                cpu_usage.append(psutil.cpu_percent(interval=None))
+                if len(cpu_usage) >= min_samples:
+                    sampled.set()
         
         monitor_thread = threading.Thread(target=monitor_cpu)
         monitor_thread.start()
@@ -285,10 +301,11 @@ class TestSystemResourceUsage:
                     markdown=True
                 )
             
-            time.sleep(0.5)  # Let monitoring catch up
+            # Wait for a handful of samples rather than sleeping a fixed interval
+            assert sampled.wait(timeout=2.0)
             
         finally:
-            monitoring = False
+            stop_monitoring.set()
             monitor_thread.join()
         
         if cpu_usage:
@@ -299,40 +316,43 @@ class TestSystemResourceUsage:
             assert avg_cpu < 50.0  # Average < 50%
             assert max_cpu < 80.0  # Peak < 80%
     
-    @pytest.mark.asyncio
-    async def test_memory_leak_detection(self):
+    @pytest.mark.perf
+    async def test_memory_leak_detection(self, format_message):
         """Test for potential memory leaks."""
         import gc
-        import psutil
-        import os
-        
-        # Get initial memory usage
-        process = psutil.Process(os.getpid())
-        initial_memory = process.memory_info().rss
-        
-        # Perform operations that might cause leaks
-        notification_service = NotificationService()
+        import tracemalloc
         
-        for i in range(100):
-            # Create and destroy many message objects
-            message = format_message(
-                title=f"Memory Test {i}",
-                message="Test message content",
-                level="INFO"
-            )
-            
-            # Simulate processing
-            await asyncio.sleep(0.001)
+        # Measure memory still held after the loop, not the process peak: a
+        # high-water mark like ru_maxrss never drops, so an already-large
+        # worker would hide any leak below its earlier peak
+        tracemalloc.start()
+        try:
+            gc.collect()
+            initial_memory, _ = tracemalloc.get_traced_memory()
             
-            # Clear reference
-            del message
+            # Perform operations that might cause leaks
+            for i in range(100):
+                # Create and destroy many message objects
+                message = format_message(
+                    title=f"Memory Test {i}",
+                    message="Test message content",
+                    level="INFO"
+                )
+                
+                # Yield to the event loop once; there is no real I/O to wait on
+                await asyncio.sleep(0)
+                
+                # Clear reference
+                del message
+                
+                if i % 20 == 0:
+                    gc.collect()  # Force garbage collection
             
-            if i % 20 == 0:
-                gc.collect()  # Force garbage collection
-        
-        # Final memory check
-        gc.collect()
-        final_memory = process.memory_info().rss
+            # Final memory check
+            gc.collect()
+            final_memory, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
         memory_increase = final_memory - initial_memory
         
         # Memory increase should be minimal (< 10MB)
@@ -2,14 +2,10 @@
 
 import pytest
 import asyncio
-import sys
 import os
 
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
-# Add the parent directory to the path to handle relative imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 
 class TestMonitoringStructure:
     """Test monitoring service structure and imports."""
@@ -49,7 +45,7 @@ class TestMonitoringService:
         assert self.service._last_alerts == {}
         assert self.service.alert_cooldown == 300
 
-    def test_start_monitoring(self):
+    async def test_start_monitoring(self):
         """Test starting monitoring service."""
         async def mock_start_monitoring(service):
             """Mock monitoring service start."""
@@ -60,15 +56,15 @@ class TestMonitoringService:
             return "started"
         
         # Test starting when not running
-        result = asyncio.run(mock_start_monitoring(self.service))
+        result = await mock_start_monitoring(self.service)
         assert result == "started"
         assert self.service.is_running is True
         
         # Test starting when already running
-        result = asyncio.run(mock_start_monitoring(self.service))
+        result = await mock_start_monitoring(self.service)
         assert result == "already_running"
 
-    def test_stop_monitoring(self):
+    async def test_stop_monitoring(self):
         """Test stopping monitoring service."""
         async def mock_stop_monitoring(service):
             """Mock monitoring service stop."""
@@ -78,7 +74,7 @@ class TestMonitoringService:
         # Set service as running
         self.service.is_running = True
         
-        result = asyncio.run(mock_stop_monitoring(self.service))
+        result = await mock_stop_monitoring(self.service)
         assert result == "stopped"
         assert self.service.is_running is False
 
@@ -129,7 +125,7 @@ class TestMonitoringService:
         
         def check_alert_cooldown(last_alerts, alert_key, cooldown_seconds):
             """Check if alert is in cooldown period."""
-            current_time = time.time()
+            current_time = time.monotonic()
             
             if alert_key in last_alerts:
                 time_diff = current_time - last_alerts[alert_key]
@@ -145,11 +141,11 @@ class TestMonitoringService:
         assert check_alert_cooldown(last_alerts, "CPU_80", cooldown) is False
         
         # Set alert time and check cooldown
-        last_alerts["CPU_80"] = time.time()
+        last_alerts["CPU_80"] = time.monotonic()
         assert check_alert_cooldown(last_alerts, "CPU_80", cooldown) is True
         
         # Test expired cooldown
-        last_alerts["CPU_80"] = time.time() - 400  # 6+ minutes ago
+        last_alerts["CPU_80"] = time.monotonic() - 400  # 6+ minutes ago
         assert check_alert_cooldown(last_alerts, "CPU_80", cooldown) is False
 
     def test_alert_message_formatting(self):
@@ -171,7 +167,7 @@ class TestMonitoringService:
         assert "92.1%" in message
         assert "85%" in message
 
-    def test_subscriber_notification(self):
+    async def test_subscriber_notification(self):
         """Test sending alerts to subscribers."""
         async def mock_send_to_subscribers(message, subscribers):
             """Mock sending message to subscribers."""
@@ -187,16 +183,16 @@ class TestMonitoringService:
         
         # Test successful notification
         subscribers = ["123456789", "987654321"]
-        results = asyncio.run(mock_send_to_subscribers("Test alert", subscribers))
+        results = await mock_send_to_subscribers("Test alert", subscribers)
         assert all(results)
         assert len(results) == 2
         
         # Test mixed results
         mixed_subscribers = ["123456789", "invalid_user", "987654321"]
-        results = asyncio.run(mock_send_to_subscribers("Test alert", mixed_subscribers))
+        results = await mock_send_to_subscribers("Test alert", mixed_subscribers)
         assert results == [True, False, True]
 
-    def test_current_metrics_retrieval(self):
+    async def test_current_metrics_retrieval(self):
         """Test retrieving current system metrics."""
         async def mock_get_current_metrics():
             """Mock getting current metrics."""
@@ -218,14 +214,14 @@ class TestMonitoringService:
                 return {}
         
         # Test successful metrics retrieval
-        metrics = asyncio.run(mock_get_current_metrics())
+        metrics = await mock_get_current_metrics()
         assert len(metrics) > 0
         assert 'cpu_percent' in metrics
         assert 'memory_percent' in metrics
         assert 'disk_percent' in metrics
         assert isinstance(metrics['cpu_percent'], float)
 
-    def test_system_report_generation(self):
+    async def test_system_report_generation(self):
         """Test system report generation and sending."""
         async def mock_send_system_report(chat_id=None, subscribers=None):
             """Mock sending system report."""
@@ -240,15 +236,15 @@ class TestMonitoringService:
                 return 0
         
         # Test sending to specific chat
-        result = asyncio.run(mock_send_system_report(chat_id="123456789"))
+        result = await mock_send_system_report(chat_id="123456789")
         assert result is True
         
         # Test sending to subscribers
         subscribers = ["123456789", "987654321", "555666777"]
-        result = asyncio.run(mock_send_system_report(subscribers=subscribers))
+        result = await mock_send_system_report(subscribers=subscribers)
         assert result == 3
 
-    def test_process_status_checking(self):
+    async def test_process_status_checking(self):
         """Test process status checking."""
         async def mock_check_process_status(process_name):
             """Mock checking if process is running."""
@@ -258,14 +254,14 @@ class TestMonitoringService:
             return process_name in running_processes
         
         # Test existing process
-        result = asyncio.run(mock_check_process_status("python"))
+        result = await mock_check_process_status("python")
         assert result is True
         
         # Test non-existing process
-        result = asyncio.run(mock_check_process_status("nonexistent"))
+        result = await mock_check_process_status("nonexistent")
         assert result is False
 
-    def test_disk_usage_checking(self):
+    async def test_disk_usage_checking(self):
         """Test disk usage checking for specific paths."""
         async def mock_get_disk_usage(path="/"):
             """Mock getting disk usage."""
@@ -291,7 +287,7 @@ class TestMonitoringService:
                 return {}
         
         # Test root path
-        usage = asyncio.run(mock_get_disk_usage("/"))
+        usage = await mock_get_disk_usage("/")
         assert 'total_gb' in usage
         assert 'used_gb' in usage
         assert 'free_gb' in usage
@@ -299,18 +295,18 @@ class TestMonitoringService:
         assert usage['percent'] == 50.1
         
         # Test tmp path
-        usage = asyncio.run(mock_get_disk_usage("/tmp"))
+        usage = await mock_get_disk_usage("/tmp")
         assert usage['percent'] == 10.2
         
         # Test invalid path
-        usage = asyncio.run(mock_get_disk_usage("/invalid"))
+        usage = await mock_get_disk_usage("/invalid")
         assert usage == {}
 
 
 class TestMonitoringServiceIntegration:
     """Test monitoring service integration scenarios."""
 
-    def test_monitoring_loop_execution(self):
+    async def test_monitoring_loop_execution(self):
         """Test the main monitoring loop."""
         async def mock_monitoring_loop(max_iterations=3):
             """Mock monitoring loop with limited iterations."""
@@ -332,11 +328,11 @@ class TestMonitoringServiceIntegration:
             return metrics_checked
         
         # Test monitoring loop
-        results = asyncio.run(mock_monitoring_loop())
+        results = await mock_monitoring_loop()
         assert len(results) == 3
         assert all('cpu' in result for result in results)
 
-    def test_error_handling_in_monitoring(self):
+    async def test_error_handling_in_monitoring(self):
         """Test error handling in monitoring operations."""
         async def mock_monitoring_with_errors(should_fail=False):
             """Mock monitoring with potential errors."""
@@ -355,16 +351,16 @@ class TestMonitoringServiceIntegration:
                 }
         
         # Test successful monitoring
-        result = asyncio.run(mock_monitoring_with_errors(should_fail=False))
+        result = await mock_monitoring_with_errors(should_fail=False)
         assert result['status'] == 'success'
         assert 'metrics' in result
         
         # Test error handling
-        result = asyncio.run(mock_monitoring_with_errors(should_fail=True))
+        result = await mock_monitoring_with_errors(should_fail=True)
         assert result['status'] == 'error'
         assert 'error' in result
 
-    def test_multiple_alert_types(self):
+    async def test_multiple_alert_types(self):
         """Test handling multiple types of alerts."""
         async def mock_check_multiple_alerts():
             """Mock checking multiple alert conditions."""
@@ -403,13 +399,13 @@ class TestMonitoringServiceIntegration:
             return alerts_triggered
         
         # Test multiple alerts
-        alerts = asyncio.run(mock_check_multiple_alerts())
+        alerts = await mock_check_multiple_alerts()
         assert 'cpu_high' in alerts
         assert 'memory_high' in alerts
         assert 'process_down' in alerts
         assert 'disk_high' not in alerts  # Below threshold
 
-    def test_subscription_service_integration(self):
+    async def test_subscription_service_integration(self):
         """Test integration with subscription service."""
         async def mock_get_system_subscribers():
             """Mock getting system alert subscribers."""
@@ -436,11 +432,11 @@ class TestMonitoringServiceIntegration:
             return {'sent': sent_count, 'failed': failed_count}
         
         # Test alert distribution
-        result = asyncio.run(mock_send_alert_to_subscribers("Test alert"))
+        result = await mock_send_alert_to_subscribers("Test alert")
         assert result['sent'] == 2
         assert result['failed'] == 1
 
-    def test_notification_service_integration(self):
+    async def test_notification_service_integration(self):
         """Test integration with notification service."""
         async def mock_notification_integration(message, chat_ids):
             """Mock notification service integration."""
@@ -461,7 +457,7 @@ class TestMonitoringServiceIntegration:
         
         # Test notification integration
         chat_ids = ["123456789", "invalid_chat", "987654321"]
-        results = asyncio.run(mock_notification_integration("System alert", chat_ids))
+        results = await mock_notification_integration("System alert", chat_ids)
         
         assert len(results) == 3
         assert results[0]['success'] is True
@@ -507,7 +503,7 @@ class TestMonitoringServiceIntegration:
         alerts = check_thresholds_with_config(normal_metrics, config)
         assert len(alerts) == 0
 
-    def test_concurrent_monitoring_operations(self):
+    async def test_concurrent_monitoring_operations(self):
         """Test concurrent monitoring operations."""
         async def mock_concurrent_checks():
             """Mock concurrent monitoring checks."""
@@ -534,7 +530,7 @@ class TestMonitoringServiceIntegration:
             return results
         
         # Test concurrent execution
-        results = asyncio.run(mock_concurrent_checks())
+        results = await mock_concurrent_checks()
         assert len(results) == 3
         assert all(isinstance(result, dict) for result in results)
         assert all('metric' in result for result in results)
@@ -2,15 +2,11 @@
 
 import pytest
 import asyncio
-import sys
 import os
 
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
-# Add the parent directory to the path to handle relative imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 
 class TestNotificationStructure:
     """Test notification service structure and imports."""
@@ -384,11 +380,18 @@ class TestNotificationServiceIntegration:
                     return False
         
         # Test different error scenarios
+        calls = 0
+        
         async def retry_after_func():
-            raise Exception("RetryAfter")
+            # Rate limited on the first attempt, accepted on the retry
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise Exception("RetryAfter")
         
         result = asyncio.run(mock_handle_telegram_errors(retry_after_func, "RetryAfter"))
-        assert result in [True, False]  # Could succeed after retry
+        assert calls == 2
+        assert result is True
         
         async def telegram_error_func():
             raise Exception("TelegramError")
@@ -404,12 +407,17 @@ class TestNotificationServiceIntegration:
             import time
             start_time = time.time()
             
-            results = []
-            for message in messages:
-                for chat_id in chat_ids:
-                    # Simulate some processing time
-                    await asyncio.sleep(0.001)
-                    results.append(True)
+            async def send(message, chat_id):
+                # Simulate some processing time
+                await asyncio.sleep(0.001)
+                return True
+            
+            # Overlap the sends rather than awaiting each one in turn
+            results = await asyncio.gather(*(
+                send(message, chat_id)
+                for message in messages
+                for chat_id in chat_ids
+            ))
             
             end_time = time.time()
             return results, (end_time - start_time)
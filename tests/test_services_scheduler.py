@@ -2,15 +2,11 @@
 
 import pytest
 import asyncio
-import sys
 import os
 
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
-# Add the parent directory to the path to handle relative imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 
 class TestSchedulerStructure:
     """Test scheduler service structure and imports."""
@@ -2,17 +2,11 @@
 
 import pytest
 import asyncio
-import sys
 import os
 import json
-import tempfile
 
-from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
-# Add the parent directory to the path to handle relative imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 
 class TestSubscriptionStructure:
     """Test subscription service structure and imports."""
@@ -33,12 +27,12 @@ class TestSubscriptionStructure:
 class TestSubscriptionService:
     """Test SubscriptionService class."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup_service(self, tmp_path):
         """Set up test environment."""
         # Create temporary file for testing
-        self.temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
-        self.temp_file.close()
-        self.temp_path = Path(self.temp_file.name)
+        self.temp_path = tmp_path / "subscriptions.json"
+        self.temp_path.touch()
         
         # Mock SubscriptionService
         class MockSubscriptionService:
@@ -54,11 +48,6 @@ class TestSubscriptionService:
         
         self.service = MockSubscriptionService(self.temp_path)
 
-    def teardown_method(self):
-        """Clean up test environment."""
-        if self.temp_path.exists():
-            self.temp_path.unlink()
-
     def test_subscription_service_initialization(self):
         """Test SubscriptionService initialization."""
         assert self.service.storage_file == self.temp_path
@@ -364,16 +353,11 @@ class TestSubscriptionService:
 class TestSubscriptionServiceIntegration:
     """Test subscription service integration scenarios."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup_temp_path(self, tmp_path):
         """Set up test environment."""
-        self.temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
-        self.temp_file.close()
-        self.temp_path = Path(self.temp_file.name)
-
-    def teardown_method(self):
-        """Clean up test environment."""
-        if self.temp_path.exists():
-            self.temp_path.unlink()
+        self.temp_path = tmp_path / "subscriptions.json"
+        self.temp_path.touch()
 
     def test_file_persistence_across_sessions(self):
         """Test subscription persistence across service restarts."""
@@ -2,14 +2,10 @@
 
 import pytest
 import datetime
-import sys
 import os
 
 from unittest.mock import patch, MagicMock
 
-# Add the parent directory to the path to handle relative imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 
 class TestFormattersStructure:
     """Test formatters module structure and imports."""
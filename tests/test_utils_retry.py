@@ -2,14 +2,10 @@
 
 import pytest
 import asyncio
-import sys
 import os
 
 from unittest.mock import AsyncMock, patch, MagicMock
 
-# Add the parent directory to the path to handle relative imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 
 class TestRetryStructure:
     """Test retry module structure and imports."""
@@ -208,8 +204,6 @@ class TestRetryHandler:
         """Test delay calculation logic."""
         def mock_calculate_delay(delay, exponential_base, attempt):
             """Mock delay calculation with exponential backoff."""
-            import random
-            
             # Exponential backoff
             calculated_delay = delay * (exponential_base ** attempt)
             
@@ -233,14 +227,14 @@ class TestRetryHandler:
             """Mock delay calculation with random jitter."""
             import random
             
-            # Set seed for predictable testing
-            random.seed(42)
+            # Use a private seeded generator so the global one is left alone
+            rng = random.Random(42)
             
             # Exponential backoff
             calculated_delay = delay * (exponential_base ** attempt)
             
             # Add jitter between 0.1 and 0.9
-            jitter = random.uniform(0.1, 0.9)
+            jitter = rng.uniform(0.1, 0.9)
             return calculated_delay * jitter, jitter
         
         # Test jitter application
@@ -1,16 +1,12 @@
 """Tests for bot utils validators."""
 
 import pytest
-import sys
 import os
 import hmac
 import hashlib
 
 from unittest.mock import patch, MagicMock
 
-# Add the parent directory to the path to handle relative imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 
 class TestValidatorsStructure:
     """Test validators module structure and imports."""